@@ -0,0 +1,406 @@
+"""Streaming strategy analytics over simulated games or recorded game logs.
+
+Games flow through generators one at a time into a Report, which keeps
+only fixed-size aggregates: running mean and variance, a quantile sketch
+per metric, and per-cell heatmaps. Memory therefore stays constant however
+many games are analyzed, and logs far larger than RAM are read through
+gamelog's memory map.
+
+Each game becomes a Trace: one player's shots at one board, with results,
+labelled by a group (the strategy, or the player in a log). A trace yields
+these metrics:
+
+    shots          shots to sink the whole fleet (finished games only)
+    first_hit      shots until the first hit
+    sunk.<Ship>    shots until that ship went down
+
+and these heatmaps of cell counts: first_hit (where the first hit
+landed) and hits (every hit).
+
+    python analytics.py parity density --games 1000000 --workers 8 --csv stats.csv
+    python analytics.py --log games.bsgl --heatmap-csv heat.csv --npz heat.npz
+"""
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from battleship import FLEET, add_board_arguments, board_options
+from simulate import SLOW_STRATEGIES, STRATEGIES, random_board
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class RunningStats:
+    """Count, mean, variance, min and max in O(1) memory (Welford's algorithm)."""
+
+    __slots__ = ('count', 'mean', 'm2', 'low', 'high')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared differences from the mean
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.low:
+            self.low = value
+        if value > self.high:
+            self.high = value
+
+    def merge(self, other):
+        """Fold in another RunningStats (Chan et al.'s parallel update)."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.low = min(self.low, other.low)
+        self.high = max(self.high, other.high)
+
+    def variance(self):
+        """Sample variance; 0 with fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def stdev(self):
+        return math.sqrt(self.variance())
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch).
+
+    Positive values fall into logarithmic buckets whose bounds grow by a
+    factor gamma = (1 + accuracy) / (1 - accuracy), so any quantile is
+    returned within `accuracy` relative error. The number of buckets only
+    depends on the range of values, not on how many were added: shot counts
+    up to 10,000 need under 500 buckets at the default 1%.
+    """
+
+    __slots__ = ('gamma', 'log_gamma', 'buckets', 'zeros', 'count')
+
+    def __init__(self, accuracy=0.01):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}  # key -> count of values in (gamma ** (key - 1), gamma ** key]
+        self.zeros = 0  # Values <= 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other):
+        if other.gamma != self.gamma:
+            raise ValueError("cannot merge sketches with different accuracy")
+        self.count += other.count
+        self.zeros += other.zeros
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def quantile(self, q):
+        """Estimated value at quantile q (0 to 1), or None if the sketch is empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Midpoint of the bucket in relative terms
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class Heatmap:
+    """Count per board cell, stored flat as row * size + col."""
+
+    __slots__ = ('size', 'counts')
+
+    def __init__(self, size):
+        self.size = size
+        self.counts = [0] * (size * size)
+
+    def add(self, row, col):
+        self.counts[row * self.size + col] += 1
+
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def rows(self):
+        """Counts as a list of rows."""
+        size = self.size
+        return [self.counts[r * size:(r + 1) * size] for r in range(size)]
+
+    def to_numpy(self):
+        """Counts as a (size, size) NumPy array. Requires NumPy."""
+        import numpy as np
+
+        return np.array(self.counts, dtype=np.int64).reshape(self.size, self.size)
+
+class Trace:
+    """One player's shots at one board: (row, col, result) in firing order."""
+
+    __slots__ = ('group', 'shots', 'finished', 'opens_game')
+
+    def __init__(self, group, shots, finished, opens_game=True):
+        self.group = group
+        self.shots = shots
+        self.finished = finished  # True if the whole fleet was sunk
+        self.opens_game = opens_game  # False for the other traces of a game already counted
+
+    def metrics(self):
+        """Yield (metric, value) pairs for this game."""
+        if self.finished:
+            yield 'shots', len(self.shots)
+        first_hit = None
+        for number, (_, _, result) in enumerate(self.shots, 1):
+            if result == 'miss':
+                continue
+            if first_hit is None:
+                first_hit = number
+                yield 'first_hit', number
+            if result.startswith('sunk_'):
+                yield 'sunk.' + result[len('sunk_'):], number
+
+    def cells(self):
+        """Yield (heatmap, row, col) pairs for this game."""
+        first = True
+        for row, col, result in self.shots:
+            if result != 'miss':
+                if first:
+                    yield 'first_hit', row, col
+                    first = False
+                yield 'hits', row, col
+
+def trace_game(group, ai, board):
+    """Let ai fire at board until the fleet is sunk and return the Trace."""
+    shots = []
+    result = shot = None
+    while True:
+        shot = ai.get_shot(result, shot)
+        result = board.receive_shot(*shot)
+        shots.append((shot[0], shot[1], result))
+        if result != 'miss' and board.all_ships_sunk():
+            return Trace(group, shots, True)
+
+def simulated_traces(strategy, games, board_size=10, fleet=FLEET):
+    """Yield a Trace per game of `strategy` firing at a fresh random fleet."""
+    factory = STRATEGIES[strategy]
+    for _ in range(games):
+        yield trace_game(strategy, factory(board_size, fleet), random_board(board_size, fleet=fleet))
+
+def logged_traces(path, groups=('player0', 'player1')):
+    """Yield two Traces per game in a gamelog file, one per shooter, labelled with groups.
+
+    Games are replayed one at a time from the memory map, so the log may be
+    larger than memory.
+    """
+    from gamelog import GameLogReader
+
+    with GameLogReader(path) as log:
+        for record in log:
+            shots = ([], [])
+            boards = None
+            for shooter, (row, col), result, boards in record.replay():
+                shots[shooter].append((row, col, result))
+            for shooter in (0, 1):
+                finished = boards is not None and boards[1 - shooter].all_ships_sunk()
+                yield Trace(groups[shooter], shots[shooter], finished, opens_game=shooter == 0)
+
+class Report:
+    """Constant-memory aggregates per (group, metric) and (group, heatmap)."""
+
+    def __init__(self, board_size=10, accuracy=0.01):
+        self.board_size = board_size
+        self.accuracy = accuracy
+        self.games = 0
+        self.stats = {}  # (group, metric) -> (RunningStats, QuantileSketch)
+        self.heatmaps = {}  # (group, heatmap) -> Heatmap
+
+    def add(self, trace):
+        if trace.opens_game:
+            self.games += 1
+        group = trace.group
+        for metric, value in trace.metrics():
+            entry = self.stats.get((group, metric))
+            if entry is None:
+                entry = self.stats[(group, metric)] = (RunningStats(), QuantileSketch(self.accuracy))
+            entry[0].add(value)
+            entry[1].add(value)
+        for name, row, col in trace.cells():
+            heatmap = self.heatmaps.get((group, name))
+            if heatmap is None:
+                heatmap = self.heatmaps[(group, name)] = Heatmap(self.board_size)
+            heatmap.add(row, col)
+
+    def consume(self, traces):
+        """Add every trace from an iterable, typically a generator; returns self."""
+        for trace in traces:
+            self.add(trace)
+        return self
+
+    def merge(self, other):
+        """Fold in a Report built elsewhere, e.g. by a worker process."""
+        self.games += other.games
+        for key, (stats, sketch) in other.stats.items():
+            if key in self.stats:
+                self.stats[key][0].merge(stats)
+                self.stats[key][1].merge(sketch)
+            else:
+                self.stats[key] = (stats, sketch)
+        for key, heatmap in other.heatmaps.items():
+            if key in self.heatmaps:
+                self.heatmaps[key].merge(heatmap)
+            else:
+                self.heatmaps[key] = heatmap
+
+    def rows(self):
+        """Yield one summary row per (group, metric), header first."""
+        yield (['group', 'metric', 'count', 'mean', 'stdev', 'min', 'max'] +
+               [f'p{round(q * 100)}' for q in QUANTILES])
+        for (group, metric), (stats, sketch) in sorted(self.stats.items()):
+            # A bucket midpoint can fall just outside the values actually seen
+            quantiles = [min(max(sketch.quantile(q), stats.low), stats.high) for q in QUANTILES]
+            yield ([group, metric, stats.count, round(stats.mean, 4), round(stats.stdev(), 4),
+                    stats.low, stats.high] + [round(value, 2) for value in quantiles])
+
+    def heatmap_rows(self):
+        """Yield one row per heatmap cell, header first."""
+        yield ['group', 'heatmap', 'row', 'col', 'count']
+        for (group, name), heatmap in sorted(self.heatmaps.items()):
+            for row, counts in enumerate(heatmap.rows()):
+                for col, count in enumerate(counts):
+                    yield [group, name, row, col, count]
+
+    def write_csv(self, path, rows):
+        """Write rows to path, or to stdout for '-'."""
+        if path == '-':
+            csv.writer(sys.stdout).writerows(rows)
+            return
+        with open(path, 'w', newline='') as f:
+            csv.writer(f).writerows(rows)
+
+    def save_npz(self, path):
+        """Save every heatmap as a (size, size) array named '<group>.<heatmap>'. Requires NumPy."""
+        import numpy as np
+
+        np.savez(path, **{f'{group}.{name}': heatmap.to_numpy()
+                          for (group, name), heatmap in sorted(self.heatmaps.items())})
+
+    def summary(self):
+        """Return a human-readable table as a list of lines."""
+        rows = list(self.rows())
+        widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+        return ['  '.join(str(value).rjust(width) if i > 1 else str(value).ljust(width)
+                          for i, (value, width) in enumerate(zip(row, widths)))
+                for row in rows]
+
+def analyze_chunk(task):
+    """Worker entry point: a Report for one chunk of simulated games."""
+    strategy, games, board_size, fleet, seed = task
+    random.seed(seed)
+    return Report(board_size).consume(simulated_traces(strategy, games, board_size, fleet))
+
+def analyze_strategies(strategies, games, board_size=10, fleet=FLEET, seed=0, workers=1,
+                       chunk_size=2000, progress=None):
+    """Simulate `games` games per strategy and return the merged Report.
+
+    Work is split into seeded chunks as in tournament.py, so results do not
+    depend on the number of workers. Chunks are submitted a few at a time
+    per worker, and each finished chunk is merged and dropped, so memory
+    does not grow with the number of games.
+    """
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {name}")
+    tasks = [(strategy, min(chunk_size, games - start), board_size, fleet, f"{seed}/{strategy}/{chunk}")
+             for strategy in strategies
+             for chunk, start in enumerate(range(0, games, chunk_size))]
+    report = Report(board_size)
+    if workers <= 1:
+        for done, task in enumerate(tasks, 1):
+            report.merge(analyze_chunk(task))
+            if progress:
+                progress(done, len(tasks))
+        return report
+    with ProcessPoolExecutor(workers) as executor:
+        pending = []
+        done = 0
+        for task in tasks:
+            pending.append(executor.submit(analyze_chunk, task))
+            if len(pending) >= 2 * workers:
+                report.merge(pending.pop(0).result())
+                done += 1
+                if progress:
+                    progress(done, len(tasks))
+        for future in pending:
+            report.merge(future.result())
+            done += 1
+            if progress:
+                progress(done, len(tasks))
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate per-game statistics and heatmaps in constant memory.")
+    default = sorted(set(STRATEGIES) - SLOW_STRATEGIES)
+    parser.add_argument('strategies', nargs='*', default=default,
+                        help=f"strategies to simulate (default: {', '.join(default)})")
+    parser.add_argument('--log', metavar='PATH', help="analyze a gamelog file instead of simulating")
+    parser.add_argument('-n', '--games', type=int, default=10000, help="games per strategy")
+    parser.add_argument('--size', type=int, default=10, help="board size")
+    add_board_arguments(parser, backend=False)
+    parser.add_argument('--seed', type=int, default=0, help="base random seed")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=2000, help="games per work unit")
+    parser.add_argument('--csv', metavar='PATH', help="write the summary statistics as CSV ('-' for stdout)")
+    parser.add_argument('--heatmap-csv', metavar='PATH', help="write the heatmaps as CSV, one row per cell")
+    parser.add_argument('--npz', metavar='PATH', help="save the heatmaps as NumPy arrays (requires NumPy)")
+    args = parser.parse_args(argv)
+    _, fleet = board_options(parser, args, [] if args.log else [args.size])
+
+    start = time.perf_counter()
+    if args.log:
+        from gamelog import GameLogReader
+
+        with GameLogReader(args.log) as log:
+            board_size = log.board_size
+        report = Report(board_size).consume(logged_traces(args.log))
+    else:
+        def progress(done, total):
+            print(f"\r{done}/{total} chunks", end='', file=sys.stderr, flush=True)
+
+        report = analyze_strategies(args.strategies, args.games, args.size,
+                                    fleet,
+                                    args.seed, args.workers, args.chunk_size, progress)
+        print(file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    print(f"{report.games} games in {elapsed:.2f}s ({report.games / elapsed:,.0f} games/sec)",
+          file=sys.stderr)
+
+    if args.csv:
+        report.write_csv(args.csv, report.rows())
+    if args.heatmap_csv:
+        report.write_csv(args.heatmap_csv, report.heatmap_rows())
+    if args.npz:
+        report.save_npz(args.npz)
+    if args.csv != '-':
+        for line in report.summary():
+            print(line)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
-import random
 import os
+import random
+import sys
 import time
+from collections import deque, namedtuple
+from functools import lru_cache
+
+from hunt import CellPool, ParityPool
+from placement import get_table
 
 # ANSI color codes
 COLOR_RESET = '\033[0m'
@@ -10,16 +16,186 @@ COLOR_DARK_BLUE = '\033[34m'  # Dark blue for water
 COLOR_LIGHT_BLUE = '\033[94m'  # Light blue for misses
 COLOR_GREEN = '\033[92m'  # Green for headers
 
+# ANSI screen control
+CLEAR_SCREEN = '\033[H\033[2J\033[3J'  # Home, clear screen and scrollback
+CLEAR_TO_END = '\033[J'
+
+# Standard fleet as (name, size, ship_type), in placement order
+FLEET = [
+    ("Aircraft Carrier", 5, 'A'),
+    ("Battleship", 4, 'B'),
+    ("Cruiser", 3, 'C'),
+    ("Destroyer", 2, 'D'),
+    ("Submarine", 3, 'S'),
+]
+
+# Pauses in play_game, in seconds, multiplied by its delay_scale (0 plays at full speed)
+FIRE_DELAY = 0.75  # Before "FIRE!"
+RESULT_DELAY = 2  # Before the result of a shot
+TURN_DELAY = 2  # Before the next turn
+
+def column_label(index):
+    """Spreadsheet-style column label: 0 -> A, 25 -> Z, 26 -> AA, ..."""
+    label = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        label = chr(ord('A') + remainder) + label
+    return label
+
+def column_index(label, size):
+    """Inverse of column_label(); returns None unless label names a column on the board."""
+    if not label or not label.isascii() or not label.isalpha():
+        return None
+    index = 0
+    for char in label.upper():
+        index = index * 26 + ord(char) - ord('A') + 1
+    index -= 1
+    return index if index < size else None
+
+def parse_target(text, size):
+    """Parse a target like 'C7' or 'AB12' into (row, col), or None if it is not on the board."""
+    text = text.strip().upper()
+    split = len(text) - len(text.lstrip('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+    col = column_index(text[:split], size)
+    row = text[split:]
+    # isdigit() alone also accepts digits like '²' that int() rejects
+    if col is None or not (row.isascii() and row.isdigit()) or not 1 <= int(row) <= size:
+        return None
+    return int(row) - 1, col
+
+def target_name(row, col):
+    """Inverse of parse_target()."""
+    return f'{column_label(col)}{row + 1}'
+
+def parse_placement(text, size):
+    """Parse a ship placement like 'A5 H' or 'c7 v' into (row, col, horizontal), or None."""
+    parts = text.split()
+    if len(parts) != 2 or parts[1].upper() not in ('H', 'V'):
+        return None
+    target = parse_target(parts[0], size)
+    if target is None:
+        return None
+    return target[0], target[1], parts[1].upper() == 'H'
+
+def script_input(lines):
+    """input() replacement that answers each prompt with the next line, echoing both.
+
+    Raises EOFError once the lines run out, as input() does at the end of a pipe.
+    """
+    lines = iter(lines)
+
+    def ask(prompt=''):
+        line = next(lines, None)
+        if line is None:
+            raise EOFError("input script ended")
+        line = line.rstrip('\r\n')
+        print(prompt + line)
+        return line
+    return ask
+
+def load_fleet(path):
+    """Load a fleet from a JSON file.
+
+    The file holds a list of ships, each {"name": ..., "size": ..., "type": ...}
+    where type is the single character shown on the board. Returns a list of
+    (name, size, ship_type) tuples like FLEET.
+    """
+    import json  # Only needed here; importing it at startup costs more than the rest of the module
+
+    with open(path) as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty list of ships")
+    fleet = []
+    for entry in entries:
+        try:
+            name, size, ship_type = entry['name'], entry['size'], entry['type']
+        except (KeyError, TypeError):
+            raise ValueError(f"{path}: every ship needs a name, size and type") from None
+        if not isinstance(size, int) or size < 1:
+            raise ValueError(f"{path}: {name} needs a positive integer size")
+        if not isinstance(ship_type, str) or len(ship_type) != 1:
+            raise ValueError(f"{path}: {name} needs a single-character type")
+        fleet.append((name, size, ship_type))
+    if len({name for name, _, _ in fleet}) != len(fleet):
+        raise ValueError(f"{path}: ship names must be unique")
+    return fleet
+
+def check_fleet(fleet, board_size):
+    """Raise ValueError unless every ship fits on the board and the whole fleet fits its area."""
+    for name, size, _ in fleet:
+        if size > board_size:
+            raise ValueError(f"{name} (size {size}) does not fit on a {board_size}x{board_size} board")
+    total = sum(size for _, size, _ in fleet)
+    if total > board_size * board_size:
+        raise ValueError(f"the fleet covers {total} cells but a {board_size}x{board_size} board "
+                         f"has only {board_size * board_size}")
+
+def add_board_arguments(parser, backend=True,
+                        fleet_help="JSON file describing the fleet (see battleship.load_fleet)"):
+    """Add --fleet, and --backend unless backend=False, to a parser; board_options() reads them."""
+    parser.add_argument('--fleet', help=fleet_help)
+    if backend:
+        parser.add_argument('--backend', choices=['list', 'bitboard'], default='list',
+                            help="board storage: list-of-lists grid or integer bitmasks")
+
+def board_options(parser, args, sizes=()):
+    """(board_class, fleet) from the add_board_arguments() options.
+
+    The fleet is checked against each board size in sizes; a bad fleet
+    file, or a fleet that does not fit, is a usage error.
+    """
+    board_class = Board
+    if getattr(args, 'backend', 'list') == 'bitboard':
+        from bitboard import BitBoard as board_class
+    try:
+        fleet = load_fleet(args.fleet) if args.fleet else FLEET
+        for size in sizes:
+            check_fleet(fleet, size)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    return board_class, fleet
+
+# Board.snapshot(): how many ships had been placed and shots received
+BoardSnapshot = namedtuple('BoardSnapshot', 'ships shots')
+
 class Ship:
+    __slots__ = ('name', 'size', 'ship_type', 'positions', 'hits', 'health')
+
     def __init__(self, name, size, ship_type):
         self.name = name
         self.size = size
         self.ship_type = ship_type  # Single letter: B, A, C, D, S
         self.positions = []
         self.hits = []
+        self.health = size  # Cells not yet hit
     
     def is_sunk(self):
-        return len(self.hits) == self.size
+        return self.health == 0
+
+    def unhit(self):
+        """Take back the most recent hit."""
+        self.hits.pop()
+        self.health += 1
+
+    def reset(self):
+        """Clear hits in place for a new game; placing the ship again sets its positions."""
+        self.hits.clear()
+        self.health = self.size
+
+    def placement(self):
+        """(row, col, horizontal) the ship was placed with; a one-cell ship counts as horizontal."""
+        row, col = self.positions[0]
+        return row, col, len(self.positions) == 1 or self.positions[1][0] == row
+
+    def copy(self):
+        """Copy with its own hits; positions are shared since placement replaces rather than mutates them."""
+        ship = Ship(self.name, self.size, self.ship_type)
+        ship.positions = self.positions
+        ship.hits = self.hits[:]
+        ship.health = self.health
+        return ship
 
 class Board:
     def __init__(self, size=10):
@@ -27,46 +203,23 @@ class Board:
         self.grid = [['~' for _ in range(size)] for _ in range(size)]
         self.ships = []
         self.shots = set()
+        self.ship_at = {}  # (row, col) -> Ship, for O(1) hit lookup
+        self.ships_afloat = 0
+        self.shot_log = []  # Shots in the order they were received
+        self.views = {}  # hide_ships -> BoardView used by display()
+        self.listeners = []  # Callbacks from subscribe()
+    
+    def cell(self, row, col):
+        """Grid character at a position: '~' water, 'S' ship, 'X' hit, 'O' miss."""
+        return self.grid[row][col]
     
     def display(self, hide_ships=False):
         """Display the board. If hide_ships=True, don't show ship positions."""
-        # Column headers (A-J)
-        print('   ' + ' '.join([chr(ord('A') + i) for i in range(self.size)]))
-        
-        for i, row in enumerate(self.grid):
-            # Row number (1-10)
-            display_row = []
-            for j, cell in enumerate(row):
-                pos = (i, j)
-                
-                # Check if this position has been shot
-                if pos in self.shots:
-                    if cell == 'X':  # Hit
-                        # Find the ship and display its type in red
-                        ship_char = 'X'
-                        for ship in self.ships:
-                            if pos in ship.positions:
-                                ship_char = ship.ship_type
-                                break
-                        display_row.append(f'{COLOR_RED}{ship_char}{COLOR_RESET}')
-                    else:  # Miss (cell == 'O')
-                        display_row.append(f'{COLOR_LIGHT_BLUE}O{COLOR_RESET}')
-                elif hide_ships and cell == 'S':
-                    # Hidden ship on opponent's board
-                    display_row.append(f'{COLOR_DARK_BLUE}~{COLOR_RESET}')
-                elif cell == 'S':
-                    # Visible ship on own board - show in light gray
-                    ship_char = 'S'
-                    for ship in self.ships:
-                        if pos in ship.positions:
-                            ship_char = ship.ship_type
-                            break
-                    display_row.append(f'{COLOR_LIGHT_GRAY}{ship_char}{COLOR_RESET}')
-                else:
-                    # Unshot water - dark blue tilde
-                    display_row.append(f'{COLOR_DARK_BLUE}~{COLOR_RESET}')
-            
-            print(f'{i+1:2} ' + ' '.join(display_row))
+        view = self.views.get(hide_ships)
+        if view is None:
+            view = self.views[hide_ships] = BoardView(self, hide_ships=hide_ships)
+        view.update()
+        print('\n'.join(view.lines()))
     
     def is_valid_placement(self, row, col, size, horizontal):
         """Check if ship placement is valid."""
@@ -98,6 +251,9 @@ class Board:
         
         ship.positions = positions
         self.ships.append(ship)
+        for pos in positions:
+            self.ship_at[pos] = ship
+        self.ships_afloat += 1
         return True
     
     def receive_shot(self, row, col):
@@ -106,34 +262,206 @@ class Board:
             return 'already_shot'
         
         self.shots.add((row, col))
+        self.shot_log.append((row, col))
         
-        if self.grid[row][col] == 'S':
-            self.grid[row][col] = 'X'  # Hit
-            # Find which ship was hit
-            for ship in self.ships:
-                if (row, col) in ship.positions:
-                    ship.hits.append((row, col))
-                    if ship.is_sunk():
-                        return f'sunk_{ship.name}'
-                    return 'hit'
-        else:
+        if self.grid[row][col] != 'S':
             self.grid[row][col] = 'O'  # Miss
+            if self.listeners:
+                self.notify(row, col, None, 'miss')
             return 'miss'
+
+        self.grid[row][col] = 'X'  # Hit
+        ship = self.ship_at[(row, col)]
+        # The shots set already turned away a repeat, so a cell is never counted twice
+        ship.hits.append((row, col))
+        ship.health -= 1
+        if ship.health == 0:
+            self.ships_afloat -= 1
+            result = f'sunk_{ship.name}'
+        else:
+            result = 'hit'
+        if self.listeners:
+            self.notify(row, col, ship, result)
+        return result
+
+    def subscribe(self, on_miss=None, on_hit=None, on_sunk=None, on_game_over=None):
+        """Have receive_shot call back as shots land; returns a handle for unsubscribe().
+
+        on_miss(board, row, col) and on_hit(board, row, col, ship) run for
+        every miss and hit, on_sunk(board, ship) after the hit that sinks a
+        ship, and on_game_over(board) after the hit that sinks the last one.
+        Callbacks run in subscription order. restore() and fork() do not
+        call them, and forks start with no subscribers.
+        """
+        listener = (on_miss, on_hit, on_sunk, on_game_over)
+        self.listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        self.listeners.remove(listener)
+
+    def notify(self, row, col, ship, result):
+        """Run the subscribed callbacks for the result of a shot."""
+        game_over = ship is not None and self.all_ships_sunk()
+        for on_miss, on_hit, on_sunk, on_game_over in self.listeners:
+            if ship is None:
+                if on_miss:
+                    on_miss(self, row, col)
+                continue
+            if on_hit:
+                on_hit(self, row, col, ship)
+            if result != 'hit' and on_sunk:
+                on_sunk(self, ship)
+            if game_over and on_game_over:
+                on_game_over(self)
     
     def all_ships_sunk(self):
         """Check if all ships are sunk."""
-        return all(ship.is_sunk() for ship in self.ships)
+        return self.ships_afloat == 0
+
+    def snapshot(self):
+        """O(1) marker of the current state for restore().
+
+        Ships and shots are only ever appended, so a snapshot is just how
+        many of each there are; restore() undoes whatever came after.
+        """
+        return BoardSnapshot(len(self.ships), len(self.shot_log))
+
+    def restore(self, snapshot):
+        """Undo the shots and placements made since snapshot, in O(changes) time.
+
+        Views are dropped, as they only render forward; a GameRenderer
+        drawing this board needs invalidate() and fresh views.
+        """
+        while len(self.shot_log) > snapshot.shots:
+            pos = self.shot_log.pop()
+            self.shots.discard(pos)
+            row, col = pos
+            ship = self.ship_at.get(pos)
+            if ship is None:
+                self.grid[row][col] = '~'
+                continue
+            self.grid[row][col] = 'S'
+            if ship.is_sunk():
+                self.ships_afloat += 1
+            ship.unhit()
+        while len(self.ships) > snapshot.ships:
+            ship = self.ships.pop()
+            for row, col in ship.positions:
+                self.grid[row][col] = '~'
+                del self.ship_at[(row, col)]
+            self.ships_afloat -= 1
+        self.views = {}
+
+    def reset(self):
+        """Empty the board in place for a new game, keeping its subscribers and display views."""
+        views = self.views
+        self.restore(BoardSnapshot(0, 0))
+        for view in views.values():
+            view.reset()
+        self.views = views
+
+    def fork(self):
+        """Independent copy for what-if play; costs a copy of the grid rows, not a deepcopy."""
+        board = object.__new__(type(self))
+        board.size = self.size
+        board.grid = [row[:] for row in self.grid]
+        board.ships = [ship.copy() for ship in self.ships]
+        board.shots = set(self.shots)
+        board.ship_at = {pos: ship for ship in board.ships for pos in ship.positions}
+        board.ships_afloat = self.ships_afloat
+        board.shot_log = self.shot_log[:]
+        board.views = {}
+        board.listeners = []
+        return board
 
 class AI:
-    def __init__(self, board_size=10):
+    """Hunt/target AI.
+
+    Hunting fires at a uniformly random unfired cell; with parity=True it
+    only considers a checkerboard spaced by the smallest ship still afloat,
+    falling back to any unfired cell. A hit queues its unfired neighbours,
+    which are fired at first-in first-out. Unfired cells live in swap-remove
+    pools and the queue is a deque with a membership set, so every decision
+    takes constant time however full the board gets.
+    """
+
+    def __init__(self, board_size=10, fleet=FLEET, parity=False):
         self.board_size = board_size
+        self.fleet = fleet
+        self.parity = parity
         self.last_hit = None
         self.target_mode = False
-        self.potential_targets = []
+        self.potential_targets = deque()
+        self.queued = set()  # Cells in potential_targets
         self.fired_shots = set()  # Track all shots fired by AI
-    
+        self.unfired = CellPool(board_size * board_size)
+        self.ship_lengths = {name: size for name, size, _ in fleet}
+        self.afloat = sorted(size for _, size, _ in fleet)
+        # One checkerboard per ship length, each at a random offset
+        self.lattices = {}
+        if parity:
+            for length in set(self.afloat):
+                if length > 1:
+                    self.lattices[length] = ParityPool(board_size, length, random.randrange(length))
+
+    def reset(self):
+        """Forget the last game in place, ready for a new one against the same fleet."""
+        self.last_hit = None
+        self.target_mode = False
+        self.potential_targets.clear()
+        self.queued.clear()
+        self.fired_shots.clear()
+        self.unfired.reset(self.board_size * self.board_size)
+        self.afloat[:] = sorted(size for _, size, _ in self.fleet)
+        # Fresh checkerboard offsets, as a new AI would draw
+        for length, lattice in self.lattices.items():
+            lattice.reset(random.randrange(length))
+
+    def fork(self):
+        """Independent copy of the AI's state; the pools copy only the cells that moved."""
+        ai = object.__new__(type(self))
+        ai.__dict__.update(self.__dict__)
+        ai.potential_targets = deque(self.potential_targets)
+        ai.queued = set(self.queued)
+        ai.fired_shots = set(self.fired_shots)
+        ai.unfired = self.unfired.copy()
+        ai.afloat = self.afloat[:]
+        ai.lattices = {length: lattice.copy() for length, lattice in self.lattices.items()}
+        return ai
+
+    def snapshot(self):
+        """Frozen copy of the AI's state for restore(); never call get_shot on it."""
+        return self.fork()
+
+    def restore(self, snapshot):
+        """Return to a snapshot's state; the snapshot stays reusable."""
+        self.__dict__.update(snapshot.fork().__dict__)
+
+    def fire(self, target):
+        """Record a shot and remove it from the hunt pools."""
+        self.fired_shots.add(target)
+        row, col = target
+        self.unfired.discard(row * self.board_size + col)
+        for lattice in self.lattices.values():
+            lattice.discard(row, col)
+        return target
+
+    def hunt(self):
+        """Pick a random unfired cell, on the current checkerboard when hunting by parity."""
+        if self.afloat:
+            lattice = self.lattices.get(self.afloat[0])
+            if lattice is not None and len(lattice):
+                return lattice.sample()
+        return divmod(self.unfired.sample(), self.board_size)
+
     def get_shot(self, previous_result=None, last_shot=None):
         """AI logic for choosing next shot."""
+        if previous_result and previous_result.startswith('sunk_'):
+            length = self.ship_lengths.get(previous_result[len('sunk_'):])
+            if length in self.afloat:
+                self.afloat.remove(length)
+
         # Smart AI: If we got a hit, target adjacent cells
         if previous_result == 'hit' and last_shot:
             self.target_mode = True
@@ -147,132 +475,336 @@ class AI:
             for pos in adjacent:
                 if (0 <= pos[0] < self.board_size and 
                     0 <= pos[1] < self.board_size and 
-                    pos not in self.potential_targets and
+                    pos not in self.queued and
                     pos not in self.fired_shots):
                     self.potential_targets.append(pos)
+                    self.queued.add(pos)
         
         # If in target mode and we have potential targets, shoot at them
-        if self.target_mode and self.potential_targets:
-            target = self.potential_targets.pop(0)
-            # Skip if already fired at this position
-            while target in self.fired_shots and self.potential_targets:
-                target = self.potential_targets.pop(0)
+        while self.target_mode and self.potential_targets:
+            target = self.potential_targets.popleft()
+            self.queued.discard(target)
             if target not in self.fired_shots:
-                self.fired_shots.add(target)
-                return target
+                return self.fire(target)
         
         # Random shot
         self.target_mode = False
-        while True:
-            row = random.randint(0, self.board_size - 1)
-            col = random.randint(0, self.board_size - 1)
-            target = (row, col)
-            if target not in self.fired_shots:
-                self.fired_shots.add(target)
-                return target
+        return self.fire(self.hunt())
+
+def terminal_size():
+    """(columns, lines) like shutil.get_terminal_size(), without importing shutil.
+
+    shutil pulls in fnmatch and re, which would double the game's startup time.
+    """
+    try:
+        columns, lines = os.get_terminal_size(sys.__stdout__.fileno())
+    except (AttributeError, ValueError, OSError):
+        columns, lines = 80, 24
+    try:
+        columns = int(os.environ['COLUMNS']) or columns
+    except (KeyError, ValueError):
+        pass
+    try:
+        lines = int(os.environ['LINES']) or lines
+    except (KeyError, ValueError):
+        pass
+    return columns, lines
+
+def label_widths(size):
+    """Character widths of one board cell and of the row-number column."""
+    return len(column_label(size - 1)), max(2, len(str(size)))
+
+def board_width(size):
+    """Visible width of a rendered board line, including the row numbers."""
+    cell_width, row_width = label_widths(size)
+    return row_width + size * (cell_width + 1)
+
+@lru_cache(maxsize=None)
+def cell_text(color, char, width):
+    """Colored, padded text for a cell; shared so big boards cache one string per kind of cell."""
+    return f'{color}{char:>{width}}{COLOR_RESET}'
+
+class BoardView:
+    """Rendered cells of one board, refreshed only where the board changed.
+
+    Every cell's colored text is cached. update() re-renders just the cells
+    touched by new shots (plus the whole ship when sunk_only reveals it) and
+    by newly placed ships, so a turn costs O(1) instead of a full rebuild.
+    hide_ships hides unshot ship cells; sunk_only shows hits as 'X' until
+    their ship sinks, as on the enemy board.
+    """
+
+    def __init__(self, board, hide_ships=False, sunk_only=False, color_labels=False):
+        self.board = board
+        self.hide_ships = hide_ships
+        self.sunk_only = sunk_only
+        self.color_labels = color_labels
+        self.cell_width, self.row_width = label_widths(board.size)
+        self.cells = [[self.render_cell(r, c) for c in range(board.size)]
+                      for r in range(board.size)]
+        self.shots_seen = len(board.shot_log)
+        self.ships_seen = len(board.ships)
+
+    def reset(self):
+        """Show every cell as water again, in place, after the board has been reset."""
+        water = cell_text(COLOR_DARK_BLUE, '~', self.cell_width)
+        for row in self.cells:
+            for col in range(len(row)):
+                row[col] = water
+        self.shots_seen = 0
+        self.ships_seen = 0
+
+    def render_cell(self, row, col):
+        """Colored text for one cell."""
+        state = self.board.cell(row, col)
+        width = self.cell_width
+        if state == 'X':  # Hit
+            ship = self.board.ship_at[(row, col)]
+            ship_char = ship.ship_type if not self.sunk_only or ship.is_sunk() else 'X'
+            return cell_text(COLOR_RED, ship_char, width)
+        if state == 'O':  # Miss
+            return cell_text(COLOR_LIGHT_BLUE, 'O', width)
+        if state == 'S' and not self.hide_ships:
+            ship_char = self.board.ship_at[(row, col)].ship_type
+            return cell_text(COLOR_LIGHT_GRAY, ship_char, width)
+        # Unshot water, or a hidden ship
+        return cell_text(COLOR_DARK_BLUE, '~', width)
+
+    def update(self):
+        """Re-render cells changed since the last update and return their positions."""
+        board = self.board
+        changed = []
+        for ship in board.ships[self.ships_seen:]:
+            changed.extend(ship.positions)
+        for pos in board.shot_log[self.shots_seen:]:
+            ship = board.ship_at.get(pos)
+            if self.sunk_only and ship is not None and ship.is_sunk():
+                changed.extend(ship.positions)
+            else:
+                changed.append(pos)
+        for row, col in changed:
+            self.cells[row][col] = self.render_cell(row, col)
+        self.shots_seen = len(board.shot_log)
+        self.ships_seen = len(board.ships)
+        return changed
+
+    def label(self, text, width):
+        text = f'{text:>{width}}'
+        return f'{COLOR_GREEN}{text}{COLOR_RESET}' if self.color_labels else text
+
+    def lines(self):
+        """Header line followed by one line per row, from the cached cells."""
+        header = ' ' * (self.row_width + 1) + ' '.join(
+            [self.label(column_label(i), self.cell_width) for i in range(self.board.size)])
+        return [header] + [self.label(i + 1, self.row_width) + ' ' + ' '.join(row)
+                           for i, row in enumerate(self.cells)]
+
+    def column_of(self, col):
+        """0-based character offset of a column's cell within a rendered line."""
+        return self.row_width + 1 + col * (self.cell_width + 1)
+
+class GameRenderer:
+    """Side-by-side game screen that repaints only the cells that changed.
+
+    The first draw() clears the screen and writes the full frame. Later
+    draws move the cursor to each changed cell with ANSI positioning
+    escapes, then clear everything below the legend so play_game can print
+    its messages and prompts there. Boards taller or wider than the
+    terminal fall back to full redraws, since positioning is unreliable
+    once the frame scrolls.
+    """
+
+    # Columns before the player board and between the two boards
+    MARGIN = 8
+    GAP = 11
+    # Lines play_round uses below the legend in its longest turn, a player
+    # turn after a bad target: blank + last turn's message, blank + error,
+    # blank + "YOUR TURN", the target prompt, blank + "FIRE!", the result,
+    # and the line the cursor is left on
+    MESSAGE_LINES = 11
+
+    def __init__(self, player_board, ai_board, fleet=FLEET, out=None):
+        self.out = out or sys.stdout
+        self.player_view = BoardView(player_board, color_labels=True)
+        self.ai_view = BoardView(ai_board, hide_ships=True, sunk_only=True, color_labels=True)
+        self.fleet = fleet
+        self.width = board_width(player_board.size)
+        self.banner = "=" * max(72, 2 * self.width + self.MARGIN + self.GAP)
+        self.drawn = False
+
+    def fits_terminal(self):
+        columns, lines = terminal_size()
+        return (lines >= self.player_view.board.size + 8 + self.MESSAGE_LINES and
+                columns >= len(self.banner))
+
+    def invalidate(self):
+        """Force a full redraw on the next draw()."""
+        self.drawn = False
+
+    def reset(self):
+        """Reuse the views for a new game once both boards have been reset."""
+        self.player_view.reset()
+        self.ai_view.reset()
+        self.drawn = False
+
+    def full_frame(self):
+        ship_types = '/'.join(dict.fromkeys(ship_type for _, _, ship_type in self.fleet))
+        spacing = ' ' * self.GAP
+        lines = [
+            self.banner,
+            " " * self.MARGIN + "YOUR BOARD".center(self.width + 1) + "ENEMY BOARD".center(2 * self.width + 2),
+            self.banner,
+        ]
+        for pl, al in zip(self.player_view.lines(), self.ai_view.lines()):
+            lines.append(" " * self.MARGIN + f"{pl}{spacing}{al}")
+        lines += [
+            "",
+            self.banner,
+            f"Legend: {COLOR_DARK_BLUE}~{COLOR_RESET} = Water, {COLOR_LIGHT_GRAY}{ship_types}{COLOR_RESET} = Ship, {COLOR_RED}X{COLOR_RESET} = Hit, {COLOR_RED}{ship_types}{COLOR_RESET} = Sunk, {COLOR_LIGHT_BLUE}O{COLOR_RESET} = Miss",
+            self.banner,
+        ]
+        return CLEAR_SCREEN + '\n'.join(lines) + '\n'
+
+    def draw(self):
+        """Bring the screen up to date and leave the cursor below the legend."""
+        player_changed = self.player_view.update()
+        ai_changed = self.ai_view.update()
+        if not self.drawn or not self.fits_terminal():
+            self.out.write(self.full_frame())
+            self.drawn = True
+        else:
+            # Screen lines are 1-based; board row r is on line 5 + r
+            parts = []
+            for view, changed, offset in ((self.player_view, player_changed, self.MARGIN),
+                                          (self.ai_view, ai_changed, self.MARGIN + self.width + self.GAP)):
+                for row, col in changed:
+                    parts.append(f'\033[{row + 5};{offset + view.column_of(col) + 1}H{view.cells[row][col]}')
+            message_line = self.player_view.board.size + 9
+            parts.append(f'\033[{message_line};1H{CLEAR_TO_END}')
+            self.out.write(''.join(parts))
+        self.out.flush()
 
 def clear_screen():
-    """Clear the console screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
-
-def setup_ships(board, is_ai=False):
-    """Set up ships on the board."""
-    ships_to_place = [
-        Ship("Aircraft Carrier", 5, 'A'),
-        Ship("Battleship", 4, 'B'),
-        Ship("Cruiser", 3, 'C'),
-        Ship("Destroyer", 2, 'D'),
-        Ship("Submarine", 3, 'S'),
-    ]
+    """Clear the console screen with ANSI escapes (no subprocess)."""
+    sys.stdout.write(CLEAR_SCREEN)
+    sys.stdout.flush()
+
+def setup_ships(board, is_ai=False, fleet=FLEET, ask=input, ships=None):
+    """Set up ships on the board. ask reads the player's answers (input, or script_input()).
+
+    ships reuses the Ship objects of an earlier game, one per fleet entry;
+    by default new ones are built from fleet. Raises ValueError if the
+    fleet cannot fit on the board (see check_fleet()).
+    """
+    check_fleet(fleet, board.size)
+    if ships is None:
+        ships_to_place = [Ship(name, size, ship_type) for name, size, ship_type in fleet]
+    else:
+        ships_to_place = ships
+        for ship in ships_to_place:
+            ship.reset()
     
     if is_ai:
-        # AI places ships randomly
-        for ship in ships_to_place:
-            placed = False
-            while not placed:
-                row = random.randint(0, board.size - 1)
-                col = random.randint(0, board.size - 1)
-                horizontal = random.choice([True, False])
-                
-                if board.is_valid_placement(row, col, ship.size, horizontal):
-                    board.place_ship(ship, row, col, horizontal)
-                    placed = True
+        # AI places ships randomly, drawing from the table of legal footprints
+        lengths = [ship.size for ship in ships_to_place]
+        table = get_table(board.size, tuple(sorted(set(lengths))))
+        for ship, index in zip(ships_to_place, table.random_fleet(lengths)):
+            row, col, horizontal = table.origin(index)
+            board.place_ship(ship, row, col, horizontal)
     else:
         # Player places ships manually
         print("\n=== SHIP PLACEMENT ===\n")
+        first_col = column_label(0)
+        error = ""  # Shown above the next prompt instead of waiting for Enter
         for ship in ships_to_place:
             placed = False
             while not placed:
                 clear_screen()
                 board.display()
                 print(f"\nPlacing {ship.name} (size {ship.size})")
+                if error:
+                    print(error)
+                    error = ""
                 
-                try:
-                    row_input = input("Enter starting row (1-10): ")
-                    row = int(row_input) - 1  # Convert to 0-indexed
-                    
-                    col_input = input("Enter starting column (A-J): ").strip().upper()
-                    if col_input not in 'ABCDEFGHIJ' or len(col_input) != 1:
-                        print("Invalid column! Use a letter from A to J")
-                        input("Press Enter to continue...")
-                        continue
-                    col = ord(col_input) - ord('A')  # Convert to 0-indexed
-                    
-                    orientation = input("Horizontal or Vertical? (h/v): ").lower()
-                    
-                    if orientation not in ['h', 'v']:
-                        print("Invalid orientation! Use 'h' or 'v'")
-                        input("Press Enter to continue...")
-                        continue
-                    
-                    horizontal = (orientation == 'h')
-                    
-                    if not (0 <= row < board.size and 0 <= col < board.size):
-                        print("Invalid coordinates!")
-                        input("Press Enter to continue...")
-                        continue
-                    
-                    if board.is_valid_placement(row, col, ship.size, horizontal):
-                        board.place_ship(ship, row, col, horizontal)
-                        placed = True
-                    else:
-                        print("Invalid placement! Ship doesn't fit or overlaps.")
-                        input("Press Enter to continue...")
+                placement = parse_placement(
+                    ask(f"Enter starting square and direction (e.g., {first_col}1 H or {first_col}1 V): "),
+                    board.size)
+                if placement is None:
+                    error = (f"Invalid input! Use a square from {first_col}1 to "
+                             f"{target_name(board.size - 1, board.size - 1)}, then H or V.")
+                    continue
                 
-                except ValueError:
-                    print("Invalid input! Please enter numbers.")
-                    input("Press Enter to continue...")
+                row, col, horizontal = placement
+                if board.is_valid_placement(row, col, ship.size, horizontal):
+                    board.place_ship(ship, row, col, horizontal)
+                    placed = True
+                else:
+                    error = "Invalid placement! Ship doesn't fit or overlaps."
+
+def play_game(board_class=Board, board_size=10, fleet=FLEET, ai_factory=AI, delay_scale=1.0, ask=input):
+    """Main game loop. board_class selects the board backend (Board or bitboard.BitBoard).
+
+    ai_factory(board_size, fleet) builds the opponent; anything with AI's
+    get_shot(previous_result, last_shot) works. delay_scale multiplies the
+    pauses between steps of a turn (0 for none), and ask reads the player's
+    answers, so script_input() can play a whole game unattended. The boards,
+    ships, renderer and AI are built once and reset in place when the player
+    plays again.
+    """
+    player_board = board_class(board_size)
+    ai_board = board_class(board_size)
+    ships = ([Ship(name, size, ship_type) for name, size, ship_type in fleet],
+             [Ship(name, size, ship_type) for name, size, ship_type in fleet])
+    renderer = GameRenderer(player_board, ai_board, fleet)
+    ai = ai_factory(board_size, fleet)
+    while True:
+        play_round(player_board, ai_board, ai, fleet, delay_scale, ask, renderer, ships)
+        play_again = ask("\nPlay again? (y/n): ").strip().lower()
+        if play_again != 'y':
+            return
+        player_board.reset()
+        ai_board.reset()
+        renderer.reset()
+        if hasattr(ai, 'reset'):
+            ai.reset()
+        else:
+            ai = ai_factory(board_size, fleet)
+
+def play_round(player_board, ai_board, ai, fleet=FLEET, delay_scale=1.0, ask=input, renderer=None,
+               ships=(None, None)):
+    """Play one game on empty boards, from ship placement to the final boards.
+
+    renderer and ships (player's, AI's) are reused from an earlier game when given.
+    """
+    def pause(seconds):
+        if delay_scale > 0:
+            time.sleep(seconds * delay_scale)
 
-def play_game():
-    """Main game loop."""
+    board_size = player_board.size
     clear_screen()
     print("=" * 50)
     print("BATTLESHIP - Player vs AI".center(50))
     print("=" * 50)
     
-    # Initialize boards
-    player_board = Board()
-    ai_board = Board()
-    ai = AI()
-    
     # Setup phase
     print("\n🚢 Welcome to Battleship! 🚢")
-    print("\nYou'll place 5 ships:")
-    print("  - Aircraft Carrier (5)")
-    print("  - Battleship (4)")
-    print("  - Cruiser (3)")
-    print("  - Submarine (3)")
-    print("  - Destroyer (2)")
+    print(f"\nYou'll place {len(fleet)} ships:")
+    for name, size, _ in fleet:
+        print(f"  - {name} ({size})")
     
-    placement_choice = input("\nManual placement or Random? (m/r): ").lower()
+    placement_choice = ask("\nManual placement or Random? (m/r): ").strip().lower()
     if placement_choice == 'r':
         print("Randomly placing your ships...")
-        setup_ships(player_board, is_ai=True)
+        setup_ships(player_board, is_ai=True, fleet=fleet, ships=ships[0])
     else:
-        input("\nPress Enter to start placing your ships...")
-        setup_ships(player_board, is_ai=False)
+        ask("\nPress Enter to start placing your ships...")
+        setup_ships(player_board, is_ai=False, fleet=fleet, ask=ask, ships=ships[0])
+    
+    setup_ships(ai_board, is_ai=True, fleet=fleet, ships=ships[1])
     
-    setup_ships(ai_board, is_ai=True)
+    if renderer is None:
+        renderer = GameRenderer(player_board, ai_board, fleet)
+    first_col, last_col = column_label(0), column_label(board_size - 1)
     
     # Game loop
     game_over = False
@@ -280,171 +812,72 @@ def play_game():
     last_ai_shot = None
     last_ai_result = None
     last_turn_message = ""  # Store message about what happened last turn
+    error = ""  # Bad input, shown with the next prompt instead of waiting for Enter
     
     while not game_over:
-        clear_screen()
-        
-        print("=" * 72)
-        print(" " * 8 + "YOUR BOARD".center(23) + "ENEMY BOARD".center(46))
-        print("=" * 72)
-        
-        # Prepare lines for both boards
-        player_lines = []
-        ai_lines = []
-        
-        # Create string representation of both boards with colors
-        # Column headers in green
-        player_lines.append('   ' + ' '.join([f"{COLOR_GREEN}{chr(ord('A') + i)}{COLOR_RESET}" for i in range(player_board.size)]))
-        ai_lines.append('   ' + ' '.join([f"{COLOR_GREEN}{chr(ord('A') + i)}{COLOR_RESET}" for i in range(ai_board.size)]))
-        
-        for i in range(player_board.size):
-            # Player board row
-            player_row_cells = []
-            for j, cell in enumerate(player_board.grid[i]):
-                pos = (i, j)
-                if pos in player_board.shots:
-                    if cell == 'X':  # Hit
-                        ship_char = 'X'
-                        for ship in player_board.ships:
-                            if pos in ship.positions:
-                                ship_char = ship.ship_type
-                                break
-                        player_row_cells.append(f'{COLOR_RED}{ship_char}{COLOR_RESET}')
-                    else:  # Miss
-                        player_row_cells.append(f'{COLOR_LIGHT_BLUE}O{COLOR_RESET}')
-                elif cell == 'S':
-                    ship_char = 'S'
-                    for ship in player_board.ships:
-                        if pos in ship.positions:
-                            ship_char = ship.ship_type
-                            break
-                    player_row_cells.append(f'{COLOR_LIGHT_GRAY}{ship_char}{COLOR_RESET}')
-                else:
-                    player_row_cells.append(f'{COLOR_DARK_BLUE}~{COLOR_RESET}')
-            
-            # Row number in green
-            player_lines.append(f'{COLOR_GREEN}{i+1:2}{COLOR_RESET} ' + ' '.join(player_row_cells))
-            
-            # AI board row (hidden ships)
-            ai_row_cells = []
-            for j, cell in enumerate(ai_board.grid[i]):
-                pos = (i, j)
-                if pos in ai_board.shots:
-                    if cell == 'X':  # Hit
-                        ship_char = 'X'
-                        # Only show ship type if the ship is sunk
-                        for ship in ai_board.ships:
-                            if pos in ship.positions:
-                                if ship.is_sunk():
-                                    ship_char = ship.ship_type
-                                break
-                        ai_row_cells.append(f'{COLOR_RED}{ship_char}{COLOR_RESET}')
-                    else:  # Miss
-                        ai_row_cells.append(f'{COLOR_LIGHT_BLUE}O{COLOR_RESET}')
-                else:
-                    ai_row_cells.append(f'{COLOR_DARK_BLUE}~{COLOR_RESET}')
-            
-            # Row number in green
-            ai_lines.append(f'{COLOR_GREEN}{i+1:2}{COLOR_RESET} ' + ' '.join(ai_row_cells))
-        
-        # Print boards side by side with proper spacing
-        # Need to calculate visible width (color codes don't count)
-        for pl, al in zip(player_lines, ai_lines):
-            # Remove ANSI codes to calculate visible width
-            visible_pl = pl.replace(COLOR_RESET, '').replace(COLOR_RED, '').replace(COLOR_LIGHT_GRAY, '').replace(COLOR_DARK_BLUE, '').replace(COLOR_LIGHT_BLUE, '').replace(COLOR_GREEN, '')
-            visible_width = len(visible_pl)
-            # Add spacing to reach column 33 based on visible width
-            spacing = ' ' * (33 - visible_width)
-            print(" " * 8 + f"{pl}{spacing}{al}")
-        
-        print("\n" + "=" * 72)
-        print(f"Legend: {COLOR_DARK_BLUE}~{COLOR_RESET} = Water, {COLOR_LIGHT_GRAY}A/B/C/D/S{COLOR_RESET} = Ship, {COLOR_RED}X{COLOR_RESET} = Hit, {COLOR_RED}A/B/C/D/S{COLOR_RESET} = Sunk, {COLOR_LIGHT_BLUE}O{COLOR_RESET} = Miss")
-        print("=" * 72)
+        renderer.draw()
         
         # Display last turn message if there is one
         if last_turn_message:
             print(f"\n{last_turn_message}")
+        if error:
+            print(f"\n{error}")
+            error = ""
         
         if player_turn:
             print("\n🎯 YOUR TURN")
-            try:
-                shot_input = input("Enter target (e.g., A5, C10): ").strip().upper()
-                
-                if len(shot_input) < 2:
-                    print("Invalid input! Please enter column letter (A-J) and row number (1-10).")
-                    input("Press Enter to continue...")
-                    continue
-                
-                col_letter = shot_input[0]
-                row_num = shot_input[1:]
-                
-                if col_letter not in 'ABCDEFGHIJ':
-                    print("Invalid column! Use a letter from A to J.")
-                    input("Press Enter to continue...")
-                    continue
-                
-                col = ord(col_letter) - ord('A')
-                row = int(row_num) - 1
-                
-                if not (0 <= row < ai_board.size):
-                    print("Invalid row! Use a number from 1 to 10.")
-                    input("Press Enter to continue...")
-                    continue
-                
-                # Show targeting message
-                print(f"\n⏳ Running ballistic trajectory calculations for {col_letter}{row_num}... ", end='', flush=True)
-                time.sleep(0.75)  # 0.75-second delay before firing
-                print(f"🎯 FIRE!")
-                time.sleep(2)  # 2-second delay before showing result
+            target = parse_target(ask("Enter target (e.g., A5, C10): "), board_size)
+            if target is None:
+                error = (f"Invalid target! Use a column letter ({first_col}-{last_col}) "
+                         f"and a row number (1-{board_size}), e.g. A5.")
+                continue
+            
+            row, col = target
+            if ai_board.cell(row, col) in ('X', 'O'):
+                error = "❌ You already shot there!"
+                continue
+            
+            # Show targeting message
+            target_pos = target_name(row, col)
+            print(f"\n⏳ Running ballistic trajectory calculations for {target_pos}... ", end='', flush=True)
+            pause(FIRE_DELAY)
+            print(f"🎯 FIRE!")
+            pause(RESULT_DELAY)
 
-                result = ai_board.receive_shot(row, col)
-                
-                if result == 'already_shot':
-                    print("❌ You already shot there!")
-                    input("Press Enter to continue...")
-                    continue
-                
-                # Create message for next turn display
-                target_pos = f"{col_letter}{row_num}"
-                if result == 'miss':
-                    last_turn_message = f"💨 You fired at {target_pos} and missed!"
-                    print("💨 MISS!")
-                elif result == 'hit':
-                    last_turn_message = f"💥 You fired at {target_pos} and hit!"
-                    print("💥 HIT!")
-                elif result.startswith('sunk_'):
-                    ship_name = result.split('_')[1]
-                    last_turn_message = f"💥💥 You fired at {target_pos} and sunk the enemy's {ship_name}!"
-                    print(f"💥💥 HIT! You sunk the {ship_name}!")
-                
-                time.sleep(2)  # 2-second delay before next turn
-                
-                if ai_board.all_ships_sunk():
-                    clear_screen()
-                    print("\n" + "=" * 50)
-                    print("🎉 CONGRATULATIONS! YOU WIN! 🎉".center(50))
-                    print("=" * 50)
-                    print("\nYou sunk all enemy ships!")
-                    game_over = True
-                else:
-                    player_turn = False
+            result = ai_board.receive_shot(row, col)
             
-            except ValueError:
-                print("Invalid input! Please enter a valid coordinate (e.g., A5, C10).")
-                input("Press Enter to continue...")
+            # Create message for next turn display
+            if result == 'miss':
+                last_turn_message = f"💨 You fired at {target_pos} and missed!"
+                print("💨 MISS!")
+            elif result == 'hit':
+                last_turn_message = f"💥 You fired at {target_pos} and hit!"
+                print("💥 HIT!")
+            elif result.startswith('sunk_'):
+                ship_name = result[len('sunk_'):]
+                last_turn_message = f"💥💥 You fired at {target_pos} and sunk the enemy's {ship_name}!"
+                print(f"💥💥 HIT! You sunk the {ship_name}!")
+            
+            pause(TURN_DELAY)
+            
+            if ai_board.all_ships_sunk():
+                clear_screen()
+                print("\n" + "=" * 50)
+                print("🎉 CONGRATULATIONS! YOU WIN! 🎉".center(50))
+                print("=" * 50)
+                print("\nYou sunk all enemy ships!")
+                game_over = True
+            else:
+                player_turn = False
         
         else:
             print("\n🤖 AI'S TURN")
             
             shot = ai.get_shot(last_ai_result, last_ai_shot)
             
-            # Convert to letter-number format for display
-            col_letter = chr(ord('A') + shot[1])
-            row_num = shot[0] + 1
-            target_pos = f"{col_letter}{row_num}"
-            
+            target_pos = target_name(*shot)
             print(f"\nAI is firing at {target_pos}...")
-            time.sleep(2)  # 2-second delay before showing result
+            pause(RESULT_DELAY)
             
             result = player_board.receive_shot(shot[0], shot[1])
             
@@ -464,11 +897,11 @@ def play_game():
                 last_turn_message = f"💥 AI fired at {target_pos} and hit your ship!"
                 print("💥 AI hit your ship!")
             elif result.startswith('sunk_'):
-                ship_name = result.split('_')[1]
+                ship_name = result[len('sunk_'):]
                 last_turn_message = f"💥💥 AI fired at {target_pos} and sunk your {ship_name}!"
                 print(f"💥💥 AI sunk your {ship_name}!")
             
-            time.sleep(2)  # 2-second delay before next turn
+            pause(TURN_DELAY)
             
             if player_board.all_ships_sunk():
                 clear_screen()
@@ -486,10 +919,62 @@ def play_game():
     player_board.display()
     print("\nEnemy Board:")
     ai_board.display(hide_ships=False)
-    
-    play_again = input("\nPlay again? (y/n): ").lower()
-    if play_again == 'y':
-        play_game()
+
+def main(argv=None):
+    """Command-line entry point.
+
+    With no options and no instrumentation variables set, the game starts
+    straight away without importing argparse, instrument or json, which
+    would pull in the re module and take most of the startup time.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv and not (os.environ.get('BATTLESHIP_INSTRUMENT') or os.environ.get('BATTLESHIP_PROFILE')):
+        try:
+            play_game()
+        except EOFError:
+            print("\nInput ended; quitting.")
+        return
+
+    import argparse
+
+    import instrument
+
+    parser = argparse.ArgumentParser(description="Play Battleship against the AI.")
+    parser.add_argument('--size', type=int, default=10, help="board size (rows and columns)")
+    add_board_arguments(parser)
+    parser.add_argument('--ai', default='hunt_target',
+                        help="opponent strategy from simulate.STRATEGIES (e.g. parity, density, monte_carlo)")
+    parser.add_argument('--delay-scale', type=float, default=1.0,
+                        help="multiplier for the pauses within a turn (0 for none)")
+    parser.add_argument('--script', metavar='PATH',
+                        help="read every answer from a file, one per line ('-' for stdin), e.g. for speedruns and tests")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for reproducible games")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    board_class, fleet = board_options(parser, args, [args.size])
+    ai_factory = AI
+    if args.ai != 'hunt_target':
+        from simulate import STRATEGIES
+        if args.ai not in STRATEGIES:
+            parser.error(f"unknown AI {args.ai!r}; choose from {', '.join(sorted(STRATEGIES))}")
+        ai_factory = STRATEGIES[args.ai]
+        limit = getattr(ai_factory, 'max_board_size', None)
+        if limit is not None and args.size > limit:
+            parser.error(f"--ai {args.ai} supports boards up to {limit}x{limit}")
+    ask = input
+    if args.script == '-':
+        ask = script_input(sys.stdin)
+    elif args.script:
+        with open(args.script) as f:
+            ask = script_input(f.readlines())
+    if args.seed is not None:
+        random.seed(args.seed)
+    instrument.setup(args.instrument, args.profile)
+    try:
+        play_game(board_class, args.size, fleet, ai_factory, args.delay_scale, ask)
+    except EOFError:
+        print("\nInput ended; quitting.")
 
 if __name__ == "__main__":
-    play_game()
\ No newline at end of file
+    main()
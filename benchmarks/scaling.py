@@ -0,0 +1,98 @@
+"""Per-shot cost of the engine hot paths as the board grows.
+
+Run from the repository root:
+
+    python -m benchmarks.scaling
+    python -m benchmarks.scaling --sizes 10 100 1000 --shots 2000
+
+DensityAI is only timed on boards up to strategies.MAX_BOARD_SIZE; larger
+sizes show nan in its column.
+"""
+import argparse
+import io
+import os
+import random
+import time
+from contextlib import redirect_stdout
+
+from battleship import AI, Board, GameRenderer, add_board_arguments, board_options, setup_ships
+from bitboard import BitBoard
+from simulate import board_from_layout, capture_layout
+from strategies import DensityAI
+
+
+def per_call(func, calls):
+    """Run func(i) for i in range(calls) and return microseconds per call."""
+    start = time.perf_counter()
+    for i in range(calls):
+        func(i)
+    return (time.perf_counter() - start) / calls * 1e6
+
+def decisions(ai, board, shots):
+    """Microseconds per ai.get_shot over `shots` shots at board, fed real results."""
+    state = [None, None]
+
+    def decide(_):
+        shot = ai.get_shot(*state)
+        state[0] = board.receive_shot(*shot)
+        state[1] = shot
+    return per_call(decide, shots)
+
+def measure(size, shots, fleet):
+    """Return a dict of timings for one board size."""
+    random.seed(size)
+    row = {}
+
+    start = time.perf_counter()
+    board = Board(size)
+    setup_ships(board, is_ai=True, fleet=fleet)
+    row['setup ms'] = (time.perf_counter() - start) * 1e3
+
+    shots = min(shots, size * size)
+    targets = [divmod(cell, size) for cell in random.sample(range(size * size), shots)]
+    row['receive_shot us'] = per_call(lambda i: board.receive_shot(*targets[i]), shots)
+    row['all_ships_sunk us'] = per_call(lambda i: board.all_ships_sunk(), shots)
+
+    bitboard = board_from_layout(capture_layout(board), size, BitBoard)
+    row['bitboard receive_shot us'] = per_call(lambda i: bitboard.receive_shot(*targets[i]), shots)
+
+    # AI decisions over the same number of shots, fed real results
+    board = Board(size)
+    setup_ships(board, is_ai=True, fleet=fleet)
+    row['AI.get_shot us'] = decisions(AI(size, fleet), board, shots)
+    row['DensityAI.get_shot us'] = float('nan')
+    if size <= DensityAI.max_board_size:
+        density_board = Board(size)
+        setup_ships(density_board, is_ai=True, fleet=fleet)
+        row['DensityAI.get_shot us'] = decisions(DensityAI(size, fleet), density_board, shots)
+
+    # One full frame; this is O(board area) by nature
+    with redirect_stdout(io.StringIO()):
+        row['full render ms'] = per_call(lambda i: board.display(), 1) / 1e3
+
+    # Incremental repaint after each shot on the side-by-side game screen.
+    # Pretend the terminal fits the frame so the renderer takes the diff path.
+    enemy = Board(size)
+    setup_ships(enemy, is_ai=True, fleet=fleet)
+    renderer = GameRenderer(board, enemy, fleet, out=io.StringIO())
+    os.environ['COLUMNS'], os.environ['LINES'] = str(len(renderer.banner)), str(size + 100)
+    renderer.draw()
+    row['diff render us'] = per_call(lambda i: (enemy.receive_shot(*targets[i]), renderer.draw()), shots)
+    return row
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show how per-shot engine costs scale with board size.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 30, 100, 300, 1000])
+    parser.add_argument('--shots', type=int, default=2000, help="shots measured per board (capped at its area)")
+    add_board_arguments(parser, backend=False)
+    args = parser.parse_args(argv)
+
+    _, fleet = board_options(parser, args, args.sizes)
+    rows = [(size, measure(size, args.shots, fleet)) for size in args.sizes]
+    columns = list(rows[0][1])
+    print('size'.rjust(6) + ''.join(name.rjust(26) for name in columns))
+    for size, row in rows:
+        print(f'{size:6}' + ''.join(f'{row[name]:26.3f}' for name in columns))
+
+if __name__ == "__main__":
+    main()
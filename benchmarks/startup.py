@@ -0,0 +1,97 @@
+"""Cold-start benchmark: time from launching the game to its first prompt and first frame.
+
+Run from the repository root:
+
+    python -m benchmarks.startup --runs 20
+    python -m benchmarks.startup --budget 5
+    python -m benchmarks.startup -- --backend bitboard
+
+Each run starts a fresh interpreter on play.py (or --entry battleship.py) with pipes for stdin
+and stdout, and times how long it takes for the placement prompt to
+appear. It then answers 'r' and times the first full game frame, which
+is drawn just before the first target prompt. Bare interpreter startup
+(`python -c pass`) is measured the same way and subtracted, since a
+process-per-connection host pays it for any program. --budget fails the
+run (exit status 1) when the median first-frame time beyond interpreter
+startup exceeds that many milliseconds. Arguments after -- go to the
+game.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_PROMPT = 'Manual placement or Random?'.encode()
+FIRST_FRAME = 'Enter target'.encode()
+
+
+def read_until(process, marker, seen):
+    """Read the child's output until marker appears; returns the output so far."""
+    while marker not in seen:
+        chunk = os.read(process.stdout.fileno(), 65536)
+        if not chunk:
+            raise RuntimeError(f"the game exited before printing {marker.decode()!r}")
+        seen += chunk
+    return seen
+
+def interpreter_start():
+    """Seconds for `python -c pass` to start and exit."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    return time.perf_counter() - start
+
+def game_start(entry, game_args):
+    """(seconds to the first prompt, seconds to the first frame) for one cold start."""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, entry), *game_args], stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
+    try:
+        seen = read_until(process, FIRST_PROMPT, b'')
+        first_prompt = time.perf_counter() - start
+        process.stdin.write(b'r\n')
+        read_until(process, FIRST_FRAME, seen)
+        first_frame = time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+    return first_prompt, first_frame
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the game from launch to its first prompt and frame.")
+    parser.add_argument('--runs', type=int, default=20, help="cold starts to time")
+    parser.add_argument('--entry', default='play.py',
+                        help="script to launch: play.py (default) or battleship.py, which is compiled on every start")
+    parser.add_argument('--budget', type=float, metavar='MS',
+                        help="fail if the median first frame takes longer than this beyond interpreter startup")
+    parser.add_argument('game_args', nargs='*', help="arguments for the game (after --)")
+    args = parser.parse_args(argv)
+
+    interpreter_start()  # Warm the OS file cache
+    game_start(args.entry, args.game_args)
+    interpreter = []
+    prompts = []
+    frames = []
+    for _ in range(args.runs):
+        interpreter.append(interpreter_start())
+        first_prompt, first_frame = game_start(args.entry, args.game_args)
+        prompts.append(first_prompt)
+        frames.append(first_frame)
+
+    base = statistics.median(interpreter)
+    print(f"{'':24}{'best ms':>10}{'median ms':>11}{'beyond python ms':>18}")
+    for name, times in (('python -c pass', interpreter), ('first prompt', prompts), ('first frame', frames)):
+        median = statistics.median(times)
+        print(f"{name:24}{min(times) * 1e3:10.2f}{median * 1e3:11.2f}{(median - base) * 1e3:18.2f}")
+
+    if args.budget is not None:
+        overhead = (statistics.median(frames) - base) * 1e3
+        if overhead > args.budget:
+            print(f"\nFirst frame takes {overhead:.2f} ms beyond interpreter startup, over the {args.budget:g} ms budget.")
+            sys.exit(1)
+        print(f"\nFirst frame within the {args.budget:g} ms budget ({overhead:.2f} ms beyond interpreter startup).")
+
+if __name__ == "__main__":
+    main()
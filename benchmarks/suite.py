@@ -0,0 +1,240 @@
+"""Benchmark suite for the engine primitives, with JSON results and regression checks.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 10
+
+Every benchmark runs at each board size and reports the best and median
+time per operation over several samples of at least --min-time seconds
+each. Comparisons use the best time, which is the least noisy; still,
+pick a threshold above the run-to-run noise of the machine. --compare
+exits with status 1 when any benchmark is slower than the baseline by
+more than the threshold.
+"""
+import argparse
+import gc
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from battleship import AI, Board, GameRenderer, add_board_arguments, board_options, setup_ships
+from simulate import play_duel, random_board
+
+# Fraction of the board already fired at for the AI decision benchmarks
+GAME_PHASES = {'early': 0.0, 'mid': 0.5, 'late': 0.9}
+
+
+def bench_setup_ships(size, fleet):
+    boards = [Board(size) for _ in range(20)]
+    start = time.perf_counter()
+    for board in boards:
+        setup_ships(board, is_ai=True, fleet=fleet)
+    return time.perf_counter() - start, len(boards)
+
+def bench_receive_shot(size, fleet):
+    board = random_board(size, fleet=fleet)
+    shots = [divmod(cell, size) for cell in random.sample(range(size * size), min(size * size, 5000))]
+    receive_shot = board.receive_shot
+    start = time.perf_counter()
+    for row, col in shots:
+        receive_shot(row, col)
+    return time.perf_counter() - start, len(shots)
+
+def bench_all_ships_sunk(size, fleet):
+    board = random_board(size, fleet=fleet)
+    all_ships_sunk = board.all_ships_sunk
+    calls = 5000
+    start = time.perf_counter()
+    for _ in range(calls):
+        all_ships_sunk()
+    return time.perf_counter() - start, calls
+
+def advance(ai, board, shots):
+    """Play `shots` AI shots at board; returns the (result, shot) to feed next."""
+    result = shot = None
+    for _ in range(shots):
+        shot = ai.get_shot(result, shot)
+        result = board.receive_shot(*shot)
+    return result, shot
+
+def bench_ai_get_shot(phase):
+    def bench(size, fleet):
+        board = random_board(size, fleet=fleet)
+        ai = AI(size, fleet)
+        area = size * size
+        decisions = max(1, area // 10)
+        result, shot = advance(ai, board, int(area * GAME_PHASES[phase]))
+        elapsed = 0.0
+        for _ in range(decisions):
+            start = time.perf_counter()
+            shot = ai.get_shot(result, shot)
+            elapsed += time.perf_counter() - start
+            result = board.receive_shot(*shot)
+        return elapsed, decisions
+    return bench
+
+def mid_game(size, fleet):
+    board = random_board(size, fleet=fleet)
+    ai = AI(size, fleet)
+    advance(ai, board, size * size // 2)
+    return board, ai
+
+def bench_fork(size, fleet):
+    board, ai = mid_game(size, fleet)
+    forks = 200
+    start = time.perf_counter()
+    for _ in range(forks):
+        board.fork()
+        ai.fork()
+    return time.perf_counter() - start, forks
+
+def bench_snapshot_restore(size, fleet):
+    board, ai = mid_game(size, fleet)
+    shots = [divmod(cell, size) for cell in range(size * size) if divmod(cell, size) not in board.shots][:5]
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        snapshot = board.snapshot()
+        for row, col in shots:
+            board.receive_shot(row, col)
+        board.restore(snapshot)
+    return time.perf_counter() - start, rounds
+
+def bench_full_render(size, fleet):
+    player_board = random_board(size, fleet=fleet)
+    ai_board = random_board(size, fleet=fleet)
+    advance(AI(size, fleet), ai_board, size * size // 3)
+    start = time.perf_counter()
+    GameRenderer(player_board, ai_board, fleet, out=io.StringIO()).draw()
+    return time.perf_counter() - start, 1
+
+def bench_headless_game(size, fleet):
+    games = max(1, 400 // size)
+    elapsed = 0.0
+    for _ in range(games):
+        first_board = random_board(size, fleet=fleet)
+        second_board = random_board(size, fleet=fleet)
+        start = time.perf_counter()
+        play_duel(AI(size, fleet), first_board, AI(size, fleet), second_board)
+        elapsed += time.perf_counter() - start
+    return elapsed, games
+
+BENCHMARKS = {
+    'setup_ships': bench_setup_ships,
+    'receive_shot': bench_receive_shot,
+    'all_ships_sunk': bench_all_ships_sunk,
+    'ai_get_shot_early': bench_ai_get_shot('early'),
+    'ai_get_shot_mid': bench_ai_get_shot('mid'),
+    'ai_get_shot_late': bench_ai_get_shot('late'),
+    'fork': bench_fork,
+    'snapshot_restore': bench_snapshot_restore,
+    'full_render': bench_full_render,
+    'headless_game': bench_headless_game,
+}
+
+def sample(bench, size, fleet, min_time):
+    """Call bench until it has been timed for at least min_time seconds; return (seconds, ops).
+
+    Garbage collection is paused meanwhile, as timeit does.
+    """
+    elapsed = ops = 0
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        while elapsed < min_time:
+            seconds, count = bench(size, fleet)
+            elapsed += seconds
+            ops += count
+    finally:
+        if collecting:
+            gc.enable()
+    return elapsed, ops
+
+def run_suite(names, sizes, fleet, repeats=5, seed=0, min_time=0.02):
+    """Run benchmarks and return {'name/size': {'best_us': ..., 'median_us': ..., 'ops': ...}}."""
+    results = {}
+    for name in names:
+        for size in sizes:
+            random.seed(f'{seed}/{name}/{size}')
+            sample(BENCHMARKS[name], size, fleet, min_time / 5)  # Warm-up
+            samples = []
+            for _ in range(repeats):
+                elapsed, ops = sample(BENCHMARKS[name], size, fleet, min_time)
+                samples.append(elapsed / ops * 1e6)
+            results[f'{name}/{size}'] = {
+                'best_us': round(min(samples), 4),
+                'median_us': round(statistics.median(samples), 4),
+                'ops': ops,
+            }
+    return results
+
+def compare(results, baseline, threshold):
+    """Print each benchmark against the baseline; return the names that regressed."""
+    regressions = []
+    print(f"{'benchmark':28}{'baseline us':>14}{'current us':>14}{'change':>10}")
+    for key, result in results.items():
+        if key not in baseline:
+            print(f"{key:28}{'-':>14}{result['best_us']:14.3f}{'new':>10}")
+            continue
+        before = baseline[key]['best_us']
+        change = (result['best_us'] - before) / before * 100 if before else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(key)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{key:28}{before:14.3f}{result['best_us']:14.3f}{change:+9.1f}%{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark engine primitives and check for regressions.")
+    parser.add_argument('benchmarks', nargs='*', default=list(BENCHMARKS),
+                        help=f"benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 30, 100])
+    add_board_arguments(parser, backend=False)
+    parser.add_argument('--repeats', type=int, default=5, help="samples per benchmark; the best is compared")
+    parser.add_argument('--min-time', type=float, default=0.02, help="seconds of timed work per sample")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', metavar='PATH', help="write results as JSON")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="percent slowdown that counts as a regression (default 10)")
+    args = parser.parse_args(argv)
+    for name in args.benchmarks:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark: {name}")
+
+    _, fleet = board_options(parser, args, args.sizes)
+    results = run_suite(args.benchmarks, args.sizes, fleet, args.repeats, args.seed, args.min_time)
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:g}%: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:g}%.")
+    else:
+        print(f"{'benchmark':28}{'best us':>14}{'median us':>14}")
+        for key, result in results.items():
+            print(f"{key:28}{result['best_us']:14.3f}{result['median_us']:14.3f}")
+
+if __name__ == "__main__":
+    main()
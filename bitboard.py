@@ -0,0 +1,263 @@
+from array import array
+from functools import lru_cache
+
+from battleship import Board, BoardSnapshot
+
+
+@lru_cache(maxsize=None)
+def line_mask(length, stride):
+    """Bitmask of `length` cells spaced `stride` bits apart, starting at bit 0."""
+    mask = 0
+    for i in range(length):
+        mask |= 1 << (i * stride)
+    return mask
+
+def cell_typecode(size):
+    """Smallest array typecode holding every cell number of a size x size board."""
+    area = size * size
+    if area <= 1 << 8:
+        return 'B'
+    if area <= 1 << 16:
+        return 'H'
+    return 'I'
+
+class ShipCells:
+    """A placed ship's (row, col) cells, computed on demand instead of stored as tuples."""
+
+    __slots__ = ('row', 'col', 'length', 'horizontal')
+
+    def __init__(self, row, col, length, horizontal):
+        self.row = row
+        self.col = col
+        self.length = length
+        self.horizontal = horizontal
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(self.length)[index]]
+        i = range(self.length)[index]
+        return (self.row, self.col + i) if self.horizontal else (self.row + i, self.col)
+
+    def __iter__(self):
+        for i in range(self.length):
+            yield (self.row, self.col + i) if self.horizontal else (self.row + i, self.col)
+
+class ShotLog:
+    """Shots in the order received, stored as cell numbers in an array; reads as (row, col) tuples."""
+
+    __slots__ = ('size', 'cells')
+
+    def __init__(self, size, cells=None):
+        self.size = size
+        self.cells = array(cell_typecode(size)) if cells is None else cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [divmod(cell, self.size) for cell in self.cells[index]]
+        return divmod(self.cells[index], self.size)
+
+    def __iter__(self):
+        size = self.size
+        for cell in self.cells:
+            yield divmod(cell, size)
+
+    def append(self, pos):
+        self.cells.append(pos[0] * self.size + pos[1])
+
+    def pop(self):
+        return divmod(self.cells.pop(), self.size)
+
+    def copy(self):
+        return ShotLog(self.size, array(self.cells.typecode, self.cells))
+
+class ShipLookup:
+    """Read-only (row, col) -> Ship mapping answered from the board's ship masks."""
+
+    __slots__ = ('board',)
+
+    def __init__(self, board):
+        self.board = board
+
+    def get(self, pos, default=None):
+        board = self.board
+        bit = 1 << (pos[0] * board.size + pos[1])
+        if board.fleet_mask & bit:
+            for ship, mask in board.ship_masks.items():
+                if mask & bit:
+                    return ship
+        return default
+
+    def __getitem__(self, pos):
+        ship = self.get(pos)
+        if ship is None:
+            raise KeyError(pos)
+        return ship
+
+    def __contains__(self, pos):
+        return self.get(pos) is not None
+
+class BitBoard:
+    """Compact board backend storing ships, shots and hits as integer bitmasks.
+
+    Cell (row, col) is bit row * size + col. Each placed ship also gets its own
+    mask, so placement checks and sunk detection are single AND/compare
+    operations, and a hit finds its ship by testing the few ship masks. The
+    public API matches Board, so the interactive game and the simulators can
+    run on either backend. To keep memory down, nothing is stored per
+    board cell: ship_at answers from the masks, a ship's positions are a
+    ShipCells computed on demand and the shot log is an array of cell
+    numbers. Ships record their hits and health as on Board. A 10x10
+    board mid-game takes about a quarter of Board's memory; the masks grow
+    with the board area, so large boards are better served by Board.
+    """
+
+    __slots__ = ('size', 'ships', 'ship_masks', 'ship_at', 'fleet_mask', 'shots_mask', 'hits_mask',
+                 'shot_log', 'views', 'listeners')
+
+    def __init__(self, size=10):
+        self.size = size
+        self.ships = []
+        self.ship_masks = {}  # Ship -> mask of its cells
+        self.ship_at = ShipLookup(self)  # (row, col) -> Ship, answered from ship_masks
+        self.fleet_mask = 0
+        self.shots_mask = 0
+        self.hits_mask = 0
+        self.shot_log = ShotLog(size)  # Shots in the order they were received
+        self.views = {}  # hide_ships -> BoardView used by display()
+        self.listeners = []  # Callbacks from subscribe()
+
+    def footprint(self, row, col, size, horizontal):
+        """Return the bitmask a ship would cover, or 0 if it leaves the board."""
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            return 0
+        if horizontal:
+            if col + size > self.size:
+                return 0
+            return ((1 << size) - 1) << (row * self.size + col)
+        if row + size > self.size:
+            return 0
+        return line_mask(size, self.size) << (row * self.size + col)
+
+    def is_valid_placement(self, row, col, size, horizontal):
+        """Check if ship placement is valid."""
+        mask = self.footprint(row, col, size, horizontal)
+        return bool(mask) and not (mask & self.fleet_mask)
+
+    def place_ship(self, ship, row, col, horizontal):
+        """Place a ship on the board."""
+        ship.positions = ShipCells(row, col, ship.size, horizontal)
+        mask = self.footprint(row, col, ship.size, horizontal)
+        self.fleet_mask |= mask
+        self.ship_masks[ship] = mask
+        self.ships.append(ship)
+        return True
+
+    def receive_shot(self, row, col):
+        """Process a shot at the given coordinates."""
+        bit = 1 << (row * self.size + col)
+        if self.shots_mask & bit:
+            return 'already_shot'
+        self.shots_mask |= bit
+        self.shot_log.cells.append(row * self.size + col)
+
+        if not (self.fleet_mask & bit):
+            if self.listeners:
+                self.notify(row, col, None, 'miss')
+            return 'miss'
+
+        self.hits_mask |= bit
+        for ship, mask in self.ship_masks.items():
+            if mask & bit:
+                break
+        ship.hits.append((row, col))
+        ship.health -= 1
+        result = f'sunk_{ship.name}' if self.hits_mask & mask == mask else 'hit'
+        if self.listeners:
+            self.notify(row, col, ship, result)
+        return result
+
+    def all_ships_sunk(self):
+        """Check if all ships are sunk."""
+        return self.hits_mask == self.fleet_mask
+
+    def snapshot(self):
+        """O(1) marker of the current state for restore(), as Board.snapshot()."""
+        return BoardSnapshot(len(self.ships), len(self.shot_log))
+
+    def restore(self, snapshot):
+        """Undo the shots and placements made since snapshot, clearing their bits."""
+        while len(self.shot_log) > snapshot.shots:
+            row, col = self.shot_log.pop()
+            bit = 1 << (row * self.size + col)
+            self.shots_mask ^= bit
+            if self.hits_mask & bit:
+                self.hits_mask ^= bit
+                self.ship_at[(row, col)].unhit()
+        while len(self.ships) > snapshot.ships:
+            self.fleet_mask ^= self.ship_masks.pop(self.ships.pop())
+        self.views = {}
+
+    reset = Board.reset
+
+    def fork(self):
+        """Independent copy; the masks are immutable ints, so only ships and the shot log are copied."""
+        board = object.__new__(type(self))
+        board.size = self.size
+        board.ships = [ship.copy() for ship in self.ships]
+        board.ship_masks = {copy: self.ship_masks[ship] for ship, copy in zip(self.ships, board.ships)}
+        board.ship_at = ShipLookup(board)
+        board.fleet_mask = self.fleet_mask
+        board.shots_mask = self.shots_mask
+        board.hits_mask = self.hits_mask
+        board.shot_log = self.shot_log.copy()
+        board.views = {}
+        board.listeners = []
+        return board
+
+    def cell(self, row, col):
+        """Grid character at a position: '~' water, 'S' ship, 'X' hit, 'O' miss."""
+        bit = 1 << (row * self.size + col)
+        if self.shots_mask & bit:
+            return 'X' if self.fleet_mask & bit else 'O'
+        return 'S' if self.fleet_mask & bit else '~'
+
+    @property
+    def shots(self):
+        """Set of (row, col) shots, built on demand for code that reads Board.shots."""
+        shots = set()
+        mask = self.shots_mask
+        while mask:
+            low = mask & -mask
+            shots.add(divmod(low.bit_length() - 1, self.size))
+            mask ^= low
+        return shots
+
+    @property
+    def grid(self):
+        """List-of-lists view using Board's cell characters, built on demand for code that reads Board.grid."""
+        grid = []
+        bit = 1
+        for _ in range(self.size):
+            row = []
+            for _ in range(self.size):
+                if self.shots_mask & bit:
+                    row.append('X' if self.fleet_mask & bit else 'O')
+                elif self.fleet_mask & bit:
+                    row.append('S')
+                else:
+                    row.append('~')
+                bit <<= 1
+            grid.append(row)
+        return grid
+
+    # Rendering only reads size, ships, ship_at, shot_log, views and cell()
+    display = Board.display
+    subscribe = Board.subscribe
+    unsubscribe = Board.unsubscribe
+    notify = Board.notify
@@ -0,0 +1,309 @@
+"""Append-only binary game records and a memory-mapped reader to scan or replay them.
+
+A log file holds games between two players (0 and 1) on one board size
+with one fleet. It starts with a header:
+
+    magic b'BSGL', version (u8), board size (u16), ship count (u8),
+    then per ship: size (u8), type length (u8), UTF-8 type,
+    name length (u8), UTF-8 name
+
+followed by records, one per game:
+
+    shot count (u32), winner (u8, 255 if unfinished),
+    player 0 layout, player 1 layout   (one footprint index per ship, fleet order)
+    shots                              (one value per shot: cell * 2 + shooter)
+
+Footprint indices come from placement.PlacementTable and take two bytes
+per ship on boards up to 100x100 with the standard fleet. Cells are
+row * size + col on the shooter's opponent's board. A 10x10 shot takes
+one byte, so a typical game is about 130 bytes. Results are not stored
+because replay() recomputes them with receive_shot. All integers are
+little-endian.
+"""
+import argparse
+import itertools
+import mmap
+import struct
+import time
+
+from battleship import FLEET, Board, Ship, target_name
+from placement import get_table
+
+MAGIC = b'BSGL'
+VERSION = 1
+FILE_HEADER = struct.Struct('<4sBHB')
+RECORD_HEADER = struct.Struct('<IB')
+UNFINISHED = 255
+
+
+def fleet_table(board_size, fleet):
+    """The PlacementTable that setup_ships uses for this board and fleet."""
+    return get_table(board_size, tuple(sorted({size for _, size, _ in fleet})))
+
+def value_code(largest):
+    """struct code of the smallest unsigned type holding values up to largest."""
+    if largest <= 0xFF:
+        return 'B'
+    if largest <= 0xFFFF:
+        return 'H'
+    return 'I'
+
+def encode_text(text, what):
+    """Length-prefixed UTF-8 for the header."""
+    encoded = text.encode()
+    if len(encoded) > 255:
+        raise ValueError(f"{what} {text[:20]!r}... is over 255 bytes in UTF-8, too long for a game log")
+    return bytes([len(encoded)]) + encoded
+
+def encode_header(board_size, fleet):
+    if len(fleet) > 255:
+        raise ValueError("a game log holds at most 255 ships per fleet")
+    parts = [FILE_HEADER.pack(MAGIC, VERSION, board_size, len(fleet))]
+    for name, size, ship_type in fleet:
+        if not 0 < size <= 255:
+            raise ValueError(f"ship size {size} of {name!r} does not fit in a game log")
+        parts.append(bytes([size]) + encode_text(ship_type, "ship type") + encode_text(name, "ship name"))
+    return b''.join(parts)
+
+def decode_header(data):
+    """Parse a file header; returns (board_size, fleet, header length)."""
+    magic, version, board_size, ships = FILE_HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a Battleship game log")
+    if version != VERSION:
+        raise ValueError(f"unsupported game log version {version}")
+    offset = FILE_HEADER.size
+    fleet = []
+    for _ in range(ships):
+        size = data[offset]
+        ship_type, offset = decode_text(data, offset + 1)
+        name, offset = decode_text(data, offset)
+        fleet.append((name, size, ship_type))
+    return board_size, fleet, offset
+
+def decode_text(data, offset):
+    """Inverse of encode_text(); returns (text, offset after it)."""
+    length = data[offset]
+    end = offset + 1 + length
+    return bytes(data[offset + 1:end]).decode(), end
+
+class RecordFormat:
+    """Sizes and struct layouts of the records for one board size and fleet."""
+
+    def __init__(self, board_size, fleet):
+        self.board_size = board_size
+        self.fleet = fleet
+        self.table = fleet_table(board_size, fleet)
+        self.layout = struct.Struct(f'<{2 * len(fleet)}{value_code(len(self.table) - 1)}')
+        self.shot_code = value_code(2 * board_size * board_size - 1)
+        self.shot_size = struct.calcsize(self.shot_code)
+
+    def encode_layout(self, board):
+        """Footprint indices of a board's ships, which must be placed in fleet order."""
+        indices = []
+        for ship in board.ships:
+            row, col, horizontal = ship.placement()
+            indices.append(self.table.index(row, col, ship.size, horizontal))
+        return indices
+
+    def place(self, board, indices):
+        """Place the fleet described by footprint indices on a fresh board."""
+        for (name, size, ship_type), index in zip(self.fleet, indices):
+            row, col, horizontal = self.table.origin(index)
+            board.place_ship(Ship(name, size, ship_type), row, col, horizontal)
+        return board
+
+class GameLogWriter:
+    """Appends game records to a log file, writing the header if the file is new.
+
+    Appending to an existing log checks that its board size and fleet match.
+    Use as a context manager, or call close() to flush buffered records.
+    """
+
+    def __init__(self, path, board_size=10, fleet=FLEET):
+        self.format = RecordFormat(board_size, fleet)
+        header = encode_header(board_size, fleet)
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(header)
+        else:
+            with open(path, 'rb') as existing:
+                found = existing.read(len(header))
+            if found != header:
+                self.file.close()
+                raise ValueError(f"{path}: board size or fleet differs from this log")
+        self.games = 0
+
+    def append(self, boards, shots, winner=None):
+        """Write one game.
+
+        boards are (player 0 board, player 1 board) with every ship placed;
+        only their layouts are stored. shots is a sequence of
+        (shooter, row, col) in firing order, each at the other player's board.
+        """
+        size = self.format.board_size
+        self._write(boards, [(row * size + col) * 2 + shooter for shooter, row, col in shots], winner)
+
+    def append_game(self, boards, winner=None, first=0):
+        """Write a game where the players alternated turns, taking shots from the boards' shot_log.
+
+        Player `first` fired first, at boards[1 - first].
+        """
+        size = self.format.board_size
+        leading = [(row * size + col) * 2 + first for row, col in boards[1 - first].shot_log]
+        trailing = [(row * size + col) * 2 + 1 - first for row, col in boards[first].shot_log]
+        if len(leading) - len(trailing) not in (0, 1):
+            raise ValueError("shot logs do not alternate; use append() with an explicit shot order")
+        values = [0] * (len(leading) + len(trailing))
+        values[0::2] = leading
+        values[1::2] = trailing
+        self._write(boards, values, winner)
+
+    def _write(self, boards, values, winner):
+        fmt = self.format
+        self.file.write(
+            RECORD_HEADER.pack(len(values), UNFINISHED if winner is None else winner) +
+            fmt.layout.pack(*fmt.encode_layout(boards[0]), *fmt.encode_layout(boards[1])) +
+            struct.pack(f'<{len(values)}{fmt.shot_code}', *values))
+        self.games += 1
+
+    def flush(self):
+        """Push buffered records to the file, e.g. after each game on a long-running server."""
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class GameRecord:
+    """One game read from a log: winner, both layouts and the raw shot values."""
+
+    __slots__ = ('format', 'offset', 'winner', 'layouts', 'values')
+
+    def __init__(self, format, offset, winner, layouts, values):
+        self.format = format
+        self.offset = offset
+        self.winner = None if winner == UNFINISHED else winner
+        self.layouts = layouts
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def shots(self):
+        """Yield (shooter, row, col) in firing order."""
+        size = self.format.board_size
+        for value in self.values:
+            row, col = divmod(value >> 1, size)
+            yield value & 1, row, col
+
+    def boards(self, board_class=Board):
+        """Fresh (player 0, player 1) boards with the recorded fleets and no shots."""
+        return tuple(self.format.place(board_class(self.format.board_size), layout)
+                     for layout in self.layouts)
+
+    def replay(self, board_class=Board):
+        """Re-fire every shot on fresh boards, yielding (shooter, (row, col), result, boards)."""
+        boards = self.boards(board_class)
+        for shooter, row, col in self.shots():
+            yield shooter, (row, col), boards[1 - shooter].receive_shot(row, col), boards
+
+class GameLogReader:
+    """Streams records from a log through a read-only memory map.
+
+    Only the record being decoded is touched, so logs of millions of games
+    scan in constant memory. A record cut short by an interrupted write at
+    the end of the file is ignored.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        board_size, fleet, self.start = decode_header(self.map)
+        self.format = RecordFormat(board_size, fleet)
+        self.board_size = board_size
+        self.fleet = fleet
+
+    def scan(self):
+        """Yield (offset, winner, shot count) per record without decoding layouts or shots."""
+        data = self.map
+        end = len(data)
+        fixed = RECORD_HEADER.size + self.format.layout.size
+        shot_size = self.format.shot_size
+        unpack = RECORD_HEADER.unpack_from
+        offset = self.start
+        while offset + fixed <= end:
+            count, winner = unpack(data, offset)
+            if offset + fixed + count * shot_size > end:
+                return
+            yield offset, None if winner == UNFINISHED else winner, count
+            offset += fixed + count * shot_size
+
+    def read(self, offset):
+        """Decode the record starting at a byte offset from scan()."""
+        fmt = self.format
+        count, winner = RECORD_HEADER.unpack_from(self.map, offset)
+        offset_layout = offset + RECORD_HEADER.size
+        indices = fmt.layout.unpack_from(self.map, offset_layout)
+        ships = len(fmt.fleet)
+        values = struct.unpack_from(f'<{count}{fmt.shot_code}', self.map, offset_layout + fmt.layout.size)
+        return GameRecord(fmt, offset, winner, (indices[:ships], indices[ships:]), values)
+
+    def __iter__(self):
+        for offset, _, _ in self.scan():
+            yield self.read(offset)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize or replay a binary Battleship game log.")
+    parser.add_argument('path', help="game log written by simulate.py --record or server.py --record")
+    parser.add_argument('--replay', type=int, metavar='N', help="print every shot of game N (0-based)")
+    args = parser.parse_args(argv)
+
+    with GameLogReader(args.path) as log:
+        if args.replay is not None:
+            found = next(itertools.islice(log.scan(), args.replay, None), None)
+            if found is None:
+                parser.error(f"the log has no game {args.replay}")
+            record = log.read(found[0])
+            boards = record.boards()
+            for player, board in enumerate(boards):
+                print(f"Player {player} fleet:")
+                board.display()
+            for turn, (shooter, (row, col), result, _) in enumerate(record.replay(), 1):
+                print(f"{turn:4}  player {shooter} fires at {target_name(row, col)}: {result}")
+            print(f"Winner: {'unfinished' if record.winner is None else f'player {record.winner}'}")
+            return
+
+        start = time.perf_counter()
+        games = shots = 0
+        wins = [0, 0]
+        for _, winner, count in log.scan():
+            games += 1
+            shots += count
+            if winner is not None:
+                wins[winner] += 1
+        elapsed = time.perf_counter() - start
+        size = len(log.map) - log.start
+        print(f"Board {log.board_size}x{log.board_size}, fleet: " + ', '.join(name for name, _, _ in log.fleet))
+        print(f"Games:          {games} (player 0 won {wins[0]}, player 1 won {wins[1]})")
+        if games:
+            print(f"Shots per game: {shots / games:.2f} mean, {size / games:.1f} bytes per game")
+            print(f"Scanned in {elapsed:.3f}s ({games / elapsed if elapsed else 0:,.0f} games/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Constant-time pools of unfired cells for the AI's hunt mode."""
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class CellPool:
+    """The integers 0..size-1 minus those discarded, with O(1) uniform sampling.
+
+    Conceptually an array that starts as [0, 1, ..., size-1]. Discarding a
+    value swaps it with the last live entry and shrinks the array by one,
+    so sampling is a single random index. Only entries that moved away from
+    their starting position are stored, so a pool costs O(1) to create
+    and its memory grows only with the number of discards.
+    """
+
+    __slots__ = ('size', 'moved', 'where')
+
+    def __init__(self, size):
+        self.size = size
+        self.moved = {}  # live position -> value, where they differ
+        self.where = {}  # value -> position, where they differ
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, value):
+        return self.where.get(value, value) < self.size
+
+    def sample(self, rng=random):
+        """A uniformly random live value."""
+        position = rng.randrange(self.size)
+        return self.moved.get(position, position)
+
+    def discard(self, value):
+        """Remove a value if it is still live."""
+        position = self.where.get(value, value)
+        last = self.size - 1
+        if position > last:
+            return
+        last_value = self.moved.pop(last, last)
+        if position != last:
+            self.moved[position] = last_value
+            self.where[last_value] = position
+        self.where[value] = last
+        self.size = last
+
+    def reset(self, size):
+        """Refill in place with 0..size-1."""
+        self.size = size
+        self.moved.clear()
+        self.where.clear()
+
+    def copy(self):
+        pool = CellPool(self.size)
+        pool.moved = self.moved.copy()
+        pool.where = self.where.copy()
+        return pool
+
+class ParityPool:
+    """Unfired cells with (row + col) % stride == offset, sampled uniformly in O(1).
+
+    Every ship of length >= stride covers at least one of these cells, so
+    hunting only on them finds every such ship with 1/stride of the shots.
+    Lattice cells are numbered row by row; each block of `stride` rows
+    holds exactly board_size of them, so a cell's number and the cell for
+    a number are computed arithmetically and the pool itself is a CellPool.
+    """
+
+    def __init__(self, board_size, stride, offset=0):
+        self.board_size = board_size
+        self.stride = stride
+        self.pool = CellPool(0)
+        self.reset(offset)
+
+    def reset(self, offset=0):
+        """Refill in place with every cell of the checkerboard at offset."""
+        board_size, stride = self.board_size, self.stride
+        self.offset = offset
+        # Row i of a block starts at this column, and row_start[i] lattice cells precede it in the block
+        self.first_col = [(offset - i) % stride for i in range(stride)]
+        self.row_start = [0] + list(accumulate(len(range(col, board_size, stride))
+                                               for col in self.first_col))
+        blocks, extra_rows = divmod(board_size, stride)
+        self.pool.reset(blocks * board_size + self.row_start[extra_rows])
+
+    def __len__(self):
+        return len(self.pool)
+
+    def cell(self, number):
+        """(row, col) of a lattice cell number."""
+        block, rest = divmod(number, self.board_size)
+        i = bisect_right(self.row_start, rest) - 1
+        col = self.first_col[i] + (rest - self.row_start[i]) * self.stride
+        return block * self.stride + i, col
+
+    def number(self, row, col):
+        """Lattice cell number of (row, col), or None if the cell is off the lattice."""
+        if (row + col - self.offset) % self.stride:
+            return None
+        block, i = divmod(row, self.stride)
+        return block * self.board_size + self.row_start[i] + (col - self.first_col[i]) // self.stride
+
+    def sample(self, rng=random):
+        return self.cell(self.pool.sample(rng))
+
+    def discard(self, row, col):
+        number = self.number(row, col)
+        if number is not None:
+            self.pool.discard(number)
+
+    def copy(self):
+        """Copy sharing the lattice geometry, with its own pool."""
+        lattice = object.__new__(ParityPool)
+        lattice.__dict__.update(self.__dict__)
+        lattice.pool = self.pool.copy()
+        return lattice
@@ -0,0 +1,220 @@
+"""Opt-in timers and counters around the engine's hot paths.
+
+Nothing here runs unless enabled: enable() swaps timing wrappers into the
+classes and functions listed in HOT_PATHS, so a normal run calls the
+original code untouched. The command-line tools enable it with
+--instrument PATH (JSON summary, '-' for stderr) and --profile PATH
+(cProfile stats file, plus a top-functions report on stderr), or with the
+BATTLESHIP_INSTRUMENT and BATTLESHIP_PROFILE environment variables.
+
+    python simulate.py --games 20000 --instrument -
+    BATTLESHIP_PROFILE=server.prof python server.py
+
+Timers and counters are process-wide, so a server reports totals across
+all of its sessions.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+
+# (module, class or None for a module-level function, attribute) to time.
+# Modules that have not been imported when enable() runs are skipped.
+HOT_PATHS = [
+    ('battleship', 'Board', 'receive_shot'),
+    ('battleship', 'Board', 'is_valid_placement'),
+    ('battleship', 'Board', 'display'),
+    ('battleship', 'AI', 'get_shot'),
+    ('battleship', 'BoardView', 'update'),
+    ('battleship', 'GameRenderer', 'draw'),
+    ('battleship', None, 'setup_ships'),
+    ('bitboard', 'BitBoard', 'receive_shot'),
+    ('bitboard', 'BitBoard', 'is_valid_placement'),
+    ('bitboard', 'BitBoard', 'display'),
+    ('strategies', 'DensityAI', 'get_shot'),
+    ('server', 'GameSession', 'send_boards'),
+]
+
+TIMERS = {}  # name -> Timer
+COUNTERS = {}  # name -> count
+PATCHES = []  # (owner, attribute, original) replaced by enable()
+enabled = False
+started = None
+
+
+class Timer:
+    """Call count, total and worst-case time of one instrumented function."""
+
+    __slots__ = ('calls', 'total', 'worst')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.worst:
+            self.worst = seconds
+
+    def summary(self):
+        return {
+            'calls': self.calls,
+            'total_ms': round(self.total * 1e3, 3),
+            'mean_us': round(self.total / self.calls * 1e6, 3) if self.calls else 0.0,
+            'max_us': round(self.worst * 1e6, 3),
+        }
+
+def count(name, n=1):
+    COUNTERS[name] = COUNTERS.get(name, 0) + n
+
+def timed(name, func):
+    """Wrap func so every call adds to TIMERS[name]."""
+    timer = TIMERS.setdefault(name, Timer())
+    clock = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timer.add(clock() - start)
+    return wrapper
+
+def timed_receive_shot(name, func):
+    """timed() for receive_shot that also counts results: shots.miss, shots.hit, shots.sunk, shots.already_shot."""
+    timer = TIMERS.setdefault(name, Timer())
+    clock = time.perf_counter
+
+    @functools.wraps(func)
+    def wrapper(self, row, col):
+        start = clock()
+        result = func(self, row, col)
+        timer.add(clock() - start)
+        count('shots.sunk' if result.startswith('sunk_') else 'shots.' + result)
+        return result
+    return wrapper
+
+class CountingRandom:
+    """Random source handed to PlacementTable._pick that counts its draws.
+
+    Each randrange() is one footprint tried; choice() only happens when the
+    quick tries all collided and the table was filtered.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def randrange(self, *args):
+        count('placement.tries')
+        return self.rng.randrange(*args)
+
+    def choice(self, seq):
+        count('placement.fallbacks')
+        return self.rng.choice(seq)
+
+def counted_pick(func):
+    @functools.wraps(func)
+    def wrapper(self, length, occupied, rng):
+        count('placement.ships')
+        return func(self, length, occupied, CountingRandom(rng))
+    return wrapper
+
+def loaded_modules(name):
+    """The imported module called name, plus __main__ if that is the same file run as a script."""
+    modules = []
+    if name in sys.modules:
+        modules.append(sys.modules[name])
+    main = sys.modules.get('__main__')
+    if os.path.basename(getattr(main, '__file__', '') or '') == name + '.py':
+        modules.append(main)
+    return modules
+
+def patch(owner, attr, wrapper):
+    PATCHES.append((owner, attr, getattr(owner, attr)))
+    setattr(owner, attr, wrapper)
+
+def enable():
+    """Install the wrappers. Safe to call more than once."""
+    global enabled, started
+    if enabled:
+        return
+    enabled = True
+    started = time.perf_counter()
+    for module_name, class_name, attr in HOT_PATHS:
+        for module in loaded_modules(module_name):
+            if class_name is None:
+                func = getattr(module, attr)
+                wrapper = timed(attr, func)
+                # Replace the function wherever it was imported by name too
+                for other in list(sys.modules.values()):
+                    if getattr(other, attr, None) is func:
+                        patch(other, attr, wrapper)
+                continue
+            cls = getattr(module, class_name)
+            wrap = timed_receive_shot if attr == 'receive_shot' else timed
+            patch(cls, attr, wrap(f'{class_name}.{attr}', cls.__dict__[attr]))
+    for module in loaded_modules('placement'):
+        patch(module.PlacementTable, '_pick', counted_pick(module.PlacementTable._pick))
+
+def disable():
+    """Put back everything enable() replaced. Collected numbers are kept."""
+    global enabled
+    while PATCHES:
+        owner, attr, original = PATCHES.pop()
+        setattr(owner, attr, original)
+    enabled = False
+
+def summary():
+    """Timers and counters collected so far, as a JSON-ready dict."""
+    return {
+        'elapsed_s': round(time.perf_counter() - started, 3) if started is not None else 0.0,
+        'timers': {name: timer.summary() for name, timer in sorted(TIMERS.items()) if timer.calls},
+        'counters': dict(sorted(COUNTERS.items())),
+    }
+
+def write_summary(path):
+    text = json.dumps(summary(), indent=2)
+    if path == '-':
+        print(text, file=sys.stderr)
+    else:
+        with open(path, 'w') as f:
+            f.write(text + '\n')
+
+def start_profile(path, top=25):
+    """Run cProfile until exit, then save stats to path and print the top functions to stderr."""
+    import cProfile
+    import pstats
+
+    profile = cProfile.Profile()
+
+    def finish():
+        profile.disable()
+        profile.dump_stats(path)
+        pstats.Stats(profile, stream=sys.stderr).sort_stats('cumulative').print_stats(top)
+
+    atexit.register(finish)
+    profile.enable()
+
+def setup(instrument_path=None, profile_path=None):
+    """Turn on whatever the flags or the environment ask for; with neither, do nothing.
+
+    Call after every module to be measured has been imported.
+    """
+    instrument_path = instrument_path or os.environ.get('BATTLESHIP_INSTRUMENT')
+    profile_path = profile_path or os.environ.get('BATTLESHIP_PROFILE')
+    if instrument_path:
+        enable()
+        atexit.register(write_summary, instrument_path)
+    if profile_path:
+        start_profile(profile_path)
+
+def add_arguments(parser):
+    """Add --instrument and --profile to a command-line parser."""
+    parser.add_argument('--instrument', metavar='PATH',
+                        help="time engine hot paths and write a JSON summary at exit ('-' for stderr)")
+    parser.add_argument('--profile', metavar='PATH', help="write cProfile stats at exit and print the top functions")
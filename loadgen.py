@@ -0,0 +1,128 @@
+"""Load generator for server.py: many concurrent games, with turn latency percentiles.
+
+Each client connects, places its ships with RANDOM and fires at random
+unshot cells until its game ends, optionally playing several games per
+connection. Turn latency is the time from sending FIRE to receiving the
+server's RESULT line. With --serve the server runs in this process on a
+free port; otherwise start `python server.py --delay-scale 0` first.
+
+    python loadgen.py --serve --clients 1000
+    python loadgen.py --port 8765 --clients 2000 --idle 5000 --think 0.05
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from battleship import add_board_arguments, board_options, target_name
+from server import GameServer, raise_open_file_limit
+
+
+async def read_until(reader, *prefixes):
+    """Read lines until one starts with any of the prefixes and return it."""
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        line = line.decode().rstrip('\n')
+        if line.startswith(prefixes):
+            return line
+
+async def play_client(host, port, games, board_size, latencies, think, rng):
+    """Play `games` games on one connection, appending FIRE -> RESULT times to latencies."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for game in range(games):
+            await read_until(reader, 'PLACE')
+            writer.write(b'RANDOM\n')
+            await read_until(reader, 'YOUR_TURN')
+            targets = [(row, col) for row in range(board_size) for col in range(board_size)]
+            rng.shuffle(targets)
+            while True:
+                if think:
+                    await asyncio.sleep(rng.uniform(0, think))
+                sent = time.perf_counter()
+                writer.write(f'FIRE {target_name(*targets.pop())}\n'.encode())
+                await read_until(reader, 'RESULT')
+                latencies.append(time.perf_counter() - sent)
+                line = await read_until(reader, 'YOUR_TURN', 'WIN', 'LOSE')
+                if line != 'YOUR_TURN':
+                    break
+            await read_until(reader, 'PLAY_AGAIN?')
+            writer.write(b'AGAIN\n' if game + 1 < games else b'QUIT\n')
+        await read_until(reader, 'BYE')
+    finally:
+        writer.close()
+
+async def idle_client(host, port, stop):
+    """Connect and sit at the placement prompt until stop is set."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await stop.wait()
+        writer.write(b'QUIT\n')
+        await writer.drain()
+    finally:
+        writer.close()
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+async def run_load(args, fleet):
+    server = None
+    host, port = args.host, args.port
+    if args.serve:
+        game_server = GameServer(args.size, fleet, delay_scale=args.delay_scale)
+        server = await game_server.start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    rng = random.Random(args.seed)
+    stop = asyncio.Event()
+    idle = [asyncio.create_task(idle_client(host, port, stop)) for _ in range(args.idle)]
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *[play_client(host, port, args.games, args.size, latencies, args.think,
+                      random.Random(rng.random())) for _ in range(args.clients)],
+        return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*idle, return_exceptions=True)
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    failures = [r for r in results if isinstance(r, Exception)]
+    latencies.sort()
+    print(f"{args.clients} concurrent clients x {args.games} games, {args.idle} idle connections")
+    print(f"Finished in {elapsed:.2f}s: {len(latencies)} turns, {len(latencies) / elapsed:,.0f} turns/s, "
+          f"{len(failures)} failed clients")
+    if failures:
+        print(f"First failure: {failures[0]!r}")
+    if latencies:
+        print("Turn latency (FIRE -> RESULT): " + ', '.join(
+            f"{name} {percentile(latencies, q) * 1e3:.2f} ms"
+            for name, q in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0))))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure server.py turn latency under many concurrent games.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--serve', action='store_true', help="run the server in this process on a free port")
+    parser.add_argument('--delay-scale', type=float, default=0.0,
+                        help="turn delay multiplier for the --serve server")
+    parser.add_argument('--clients', type=int, default=1000, help="concurrent playing connections")
+    parser.add_argument('--games', type=int, default=1, help="games per connection")
+    parser.add_argument('--idle', type=int, default=0, help="extra connections that never play")
+    parser.add_argument('--think', type=float, default=0.0, help="max random pause before each shot, in seconds")
+    parser.add_argument('--size', type=int, default=10, help="board size (must match the server)")
+    add_board_arguments(parser, backend=False, fleet_help="JSON file describing the fleet for the --serve server")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for the clients' shots")
+    args = parser.parse_args(argv)
+    _, fleet = board_options(parser, args, [args.size])
+
+    raise_open_file_limit()
+    asyncio.run(run_load(args, fleet))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import random
+from array import array
+from functools import lru_cache
+
+# Random picks from the full table before falling back to filtering it
+QUICK_TRIES = 8
+
+
+class PlacementTable:
+    """Every legal ship footprint on an empty square board.
+
+    Footprints are numbered per ship length: by_length[length] is the range of
+    indices for that length, horizontal footprints first (row-major by
+    origin) and then vertical ones. The origin, length and cells of a
+    footprint are computed from its index, so the table costs O(1) memory at
+    any board size and a fleet can be stored compactly as one footprint
+    index per ship.
+    """
+
+    def __init__(self, board_size, lengths):
+        self.board_size = board_size
+        self.by_length = {}
+        self._starts = []  # (first index, length) per length, in index order
+        start = 0
+        for length in sorted(set(lengths)):
+            if not 1 <= length <= board_size:
+                raise ValueError(f"a ship of size {length} does not fit on a {board_size}x{board_size} board")
+            count = board_size * (board_size - length + 1) * (2 if length > 1 else 1)
+            self.by_length[length] = range(start, start + count)
+            self._starts.append((start, length))
+            start += count
+        self.size = start
+
+    def __len__(self):
+        return self.size
+
+    def _locate(self, index):
+        for start, length in reversed(self._starts):
+            if index >= start:
+                return index - start, length
+        raise IndexError(index)
+
+    def length(self, index):
+        """Ship length of a footprint."""
+        return self._locate(index)[1]
+
+    def origin(self, index):
+        """(row, col, horizontal) of a footprint's first cell."""
+        offset, length = self._locate(index)
+        return self._origin(offset, length)
+
+    def _origin(self, offset, length):
+        span = self.board_size - length + 1
+        if offset < self.board_size * span:
+            row, col = divmod(offset, span)
+            return row, col, True
+        row, col = divmod(offset - self.board_size * span, self.board_size)
+        return row, col, False
+
+    def index(self, row, col, length, horizontal):
+        """Inverse of origin(): the footprint index of a ship placed at (row, col)."""
+        span = self.board_size - length + 1
+        if horizontal or length == 1:
+            offset = row * span + col
+        else:
+            offset = self.board_size * span + row * self.board_size + col
+        return self.by_length[length][offset]
+
+    def cells(self, index):
+        """Cell indices (row * board_size + col) covered by a footprint."""
+        offset, length = self._locate(index)
+        return self._cells(offset, length)
+
+    def _cells(self, offset, length):
+        size = self.board_size
+        span = size - length + 1
+        if offset < size * span:
+            row, col = divmod(offset, span)
+            first = row * size + col
+            return range(first, first + length)
+        first = offset - size * span
+        return range(first, first + size * length, size)
+
+    def _fits(self, index, occupied):
+        return occupied.isdisjoint(self.cells(index))
+
+    def sample(self, length, occupied=frozenset(), rng=random):
+        """Pick a footprint of the given length uniformly among those clear of `occupied`.
+
+        occupied is a set of cell indices. A few random picks from the full
+        table are tried first, which is almost always enough; if they all
+        collide, the table is filtered down to the free footprints, so the
+        cost never grows without bound.
+        """
+        return self._pick(length, occupied, rng)[0]
+
+    def _pick(self, length, occupied, rng):
+        """sample() that also returns the chosen footprint's cells."""
+        ids = self.by_length[length]
+        for _ in range(QUICK_TRIES):
+            offset = rng.randrange(len(ids))
+            cells = self._cells(offset, length)
+            if occupied.isdisjoint(cells):
+                return ids[offset], cells
+        free = [index for index in ids if self._fits(index, occupied)]
+        if not free:
+            raise ValueError(f"No room left for a ship of size {length}")
+        index = rng.choice(free)
+        return index, self.cells(index)
+
+    def random_fleet(self, lengths, rng=random):
+        """Place ships one at a time, each uniformly among the spots still free.
+
+        This is the same distribution as setup_ships' original rejection
+        sampling. Returns one footprint index per ship.
+        """
+        occupied = set()
+        fleet = []
+        for length in lengths:
+            index, cells = self._pick(length, occupied, rng)
+            occupied.update(cells)
+            fleet.append(index)
+        return fleet
+
+    def uniform_fleet(self, lengths, rng=random, max_tries=100000):
+        """Pick a fleet uniformly among all valid non-overlapping fleets.
+
+        Every ship is drawn independently from the full table and the whole
+        fleet is redrawn on any overlap. Returns one footprint index per ship.
+        """
+        tables = [self.by_length[length] for length in lengths]
+        for _ in range(max_tries):
+            occupied = set()
+            fleet = []
+            for ids in tables:
+                index = ids[rng.randrange(len(ids))]
+                if not self._fits(index, occupied):
+                    break
+                occupied.update(self.cells(index))
+                fleet.append(index)
+            else:
+                return fleet
+        raise ValueError("Fleet is too dense to sample uniformly; use random_fleet instead")
+
+    def generate_layouts(self, count, lengths, uniform=False, rng=random):
+        """Generate `count` fleets as one flat array of footprint indices.
+
+        Fleet i occupies entries i * len(lengths) to (i + 1) * len(lengths).
+        The array uses two bytes per ship when the table fits, and can be
+        viewed without copying as a NumPy array (numpy.frombuffer).
+        """
+        layouts = array('H' if self.size <= 0xFFFF else 'I')
+        pick = self.uniform_fleet if uniform else self.random_fleet
+        for _ in range(count):
+            layouts.extend(pick(lengths, rng))
+        return layouts
+
+@lru_cache(maxsize=None)
+def get_table(board_size, lengths):
+    """Shared PlacementTable for a board size and a tuple of ship lengths."""
+    return PlacementTable(board_size, lengths)
@@ -0,0 +1,10 @@
+"""Fast-starting launcher for the terminal game: python play.py [battleship.py options].
+
+Python compiles a script run directly on every launch but imports modules
+from cached bytecode, so this stub starts faster than python battleship.py,
+which matters when each connection or test run is a new process.
+"""
+from battleship import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Asyncio Battleship server: many player-vs-AI games over a line protocol.
+
+Every connection is one session coroutine driving a small state machine
+built from Board, AI and setup_ships. Turn delays are asyncio.sleep calls,
+so thousands of idle and active sessions share a single thread. The
+protocol is plain text, one command or reply per line, so `nc` or `telnet`
+is enough to play:
+
+    client                      server
+                                WELCOME <size> <ships>
+                                PLACE <ship name> <ship size>   (one per ship)
+    RANDOM                      READY
+    PLACE A5 H                  READY                           (after the last ship)
+                                YOUR_TURN
+    FIRE C7                     RESULT C7 miss|hit|sunk <ship name>
+                                AI_FIRE D4
+                                AI_RESULT D4 miss|hit|sunk <ship name>
+                                YOUR_TURN
+                                WIN | LOSE
+                                PLAY_AGAIN?
+    AGAIN | QUIT                WELCOME ... | BYE
+
+BOARD prints both boards at any time, QUIT ends the session, and a bad
+command gets `ERROR <reason>` without changing state.
+"""
+import argparse
+import asyncio
+import signal
+import time
+
+import instrument
+from battleship import (AI, FIRE_DELAY, FLEET, RESULT_DELAY, TURN_DELAY, Board, BoardView, Ship,
+                        add_board_arguments, board_options, column_label, parse_placement, parse_target,
+                        setup_ships, target_name)
+
+# Session states
+PLACEMENT = 'placement'
+PLAYER_TURN = 'player_turn'
+GAME_OVER = 'game_over'
+CLOSED = 'closed'
+
+def describe(result):
+    """Protocol form of a receive_shot() result: 'miss', 'hit' or 'sunk <ship name>'."""
+    if result.startswith('sunk_'):
+        return 'sunk ' + result[len('sunk_'):]
+    return result
+
+class GameSession:
+    """One connected player: a state machine fed one protocol line at a time.
+
+    run() reads lines and dispatches them to the handler for the current
+    state. Finishing a game moves to GAME_OVER, and AGAIN starts a fresh
+    game in the same loop, so any number of games never grows the stack.
+    """
+
+    def __init__(self, reader, writer, board_size=10, fleet=FLEET, board_class=Board,
+                 delay_scale=1.0, idle_timeout=None, log=None):
+        self.reader = reader
+        self.writer = writer
+        self.board_size = board_size
+        self.fleet = fleet
+        self.board_class = board_class
+        self.delay_scale = delay_scale
+        self.idle_timeout = idle_timeout
+        self.log = log
+        self.handlers = {
+            PLACEMENT: self.on_placement,
+            PLAYER_TURN: self.on_player_turn,
+            GAME_OVER: self.on_game_over,
+        }
+        self.games = 0
+
+    def send(self, *lines):
+        self.writer.write(''.join(line + '\n' for line in lines).encode())
+
+    async def pause(self, seconds):
+        if self.delay_scale > 0:
+            await asyncio.sleep(seconds * self.delay_scale)
+
+    def new_game(self):
+        """Reset boards and AI and prompt for the first ship."""
+        self.player_board = self.board_class(self.board_size)
+        self.ai_board = self.board_class(self.board_size)
+        self.ai = AI(self.board_size, self.fleet)
+        self.to_place = [Ship(name, size, ship_type) for name, size, ship_type in self.fleet]
+        self.last_ai_shot = None
+        self.last_ai_result = None
+        self.views = None
+        self.state = PLACEMENT
+        self.games += 1
+        self.send(f'WELCOME {self.board_size} {len(self.fleet)}')
+        self.prompt_placement()
+
+    def prompt_placement(self):
+        ship = self.to_place[0]
+        self.send(f'PLACE {ship.name} {ship.size}')
+
+    def start_battle(self):
+        setup_ships(self.ai_board, is_ai=True, fleet=self.fleet)
+        self.state = PLAYER_TURN
+        self.send('READY', 'YOUR_TURN')
+
+    async def run(self):
+        """Serve this connection until QUIT, EOF or the idle timeout."""
+        self.new_game()
+        try:
+            while self.state != CLOSED:
+                await self.writer.drain()
+                line = await asyncio.wait_for(self.reader.readline(), self.idle_timeout)
+                if not line:
+                    break
+                command, _, args = line.decode(errors='replace').strip().partition(' ')
+                command = command.upper()
+                if not command:
+                    continue
+                if command == 'QUIT':
+                    self.send('BYE')
+                    self.state = CLOSED
+                elif command == 'BOARD':
+                    self.send_boards()
+                else:
+                    await self.handlers[self.state](command, args.strip())
+            await self.writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass  # Idle, or client gone; cancellation (server shutting down) propagates after cleanup
+        finally:
+            if self.state == PLAYER_TURN and self.player_board.shot_log:
+                self.record(None)  # Abandoned mid-game
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def on_placement(self, command, args):
+        if command == 'RANDOM':
+            setup_ships(self.player_board, is_ai=True, fleet=self.fleet)
+            self.start_battle()
+            return
+        if command != 'PLACE':
+            self.send('ERROR expected RANDOM or PLACE <target> <H|V>')
+            return
+        placement = parse_placement(args, self.board_size)
+        if placement is None:
+            self.send('ERROR usage: PLACE <target> <H|V>')
+            return
+        ship = self.to_place[0]
+        row, col, horizontal = placement
+        if not self.player_board.is_valid_placement(row, col, ship.size, horizontal):
+            self.send("ERROR ship doesn't fit or overlaps")
+            return
+        self.player_board.place_ship(ship, row, col, horizontal)
+        self.to_place.pop(0)
+        if self.to_place:
+            self.prompt_placement()
+        else:
+            self.start_battle()
+
+    async def on_player_turn(self, command, args):
+        if command != 'FIRE':
+            self.send('ERROR expected FIRE <target>')
+            return
+        target = parse_target(args, self.board_size)
+        if target is None:
+            self.send(f'ERROR invalid target, use {column_label(0)}1 to '
+                      f'{target_name(self.board_size - 1, self.board_size - 1)}')
+            return
+        result = self.ai_board.receive_shot(*target)
+        if result == 'already_shot':
+            self.send('ERROR already shot there')
+            return
+
+        await self.pause(FIRE_DELAY + RESULT_DELAY)
+        self.send(f'RESULT {target_name(*target)} {describe(result)}')
+        if result != 'miss' and self.ai_board.all_ships_sunk():
+            self.end_game('WIN')
+            return
+        await self.pause(TURN_DELAY)
+        await self.ai_turn()
+
+    async def ai_turn(self):
+        shot = self.ai.get_shot(self.last_ai_result, self.last_ai_shot)
+        self.send(f'AI_FIRE {target_name(*shot)}')
+        await self.writer.drain()
+        await self.pause(RESULT_DELAY)
+        result = self.player_board.receive_shot(*shot)
+        while result == 'already_shot':
+            shot = self.ai.get_shot(None, None)
+            result = self.player_board.receive_shot(*shot)
+        self.last_ai_shot = shot
+        self.last_ai_result = result
+        self.send(f'AI_RESULT {target_name(*shot)} {describe(result)}')
+        if result != 'miss' and self.player_board.all_ships_sunk():
+            self.end_game('LOSE')
+            return
+        await self.pause(TURN_DELAY)
+        self.send('YOUR_TURN')
+
+    def end_game(self, outcome):
+        self.state = GAME_OVER
+        self.record(0 if outcome == 'WIN' else 1)
+        self.send(outcome, 'PLAY_AGAIN?')
+
+    def record(self, winner):
+        """Append the game to the log, the player as player 0 (who fires first) and the AI as player 1."""
+        if self.log is not None:
+            self.log.append_game((self.player_board, self.ai_board), winner)
+            self.log.flush()
+
+    async def on_game_over(self, command, args):
+        if command in ('AGAIN', 'Y', 'YES'):
+            self.new_game()
+        elif command in ('N', 'NO'):
+            self.send('BYE')
+            self.state = CLOSED
+        else:
+            self.send('ERROR expected AGAIN or QUIT')
+
+    def send_boards(self):
+        """Both boards as rendered by the game, enemy ships hidden until the game ends."""
+        if self.views is None:
+            self.views = (BoardView(self.player_board),
+                          BoardView(self.ai_board, hide_ships=True, sunk_only=True),
+                          BoardView(self.ai_board))
+        player_view, hidden_view, revealed_view = self.views
+        ai_view = revealed_view if self.state == GAME_OVER else hidden_view
+        for view in self.views:
+            view.update()
+        self.send('YOUR BOARD', *player_view.lines(), 'ENEMY BOARD', *ai_view.lines())
+
+class GameServer:
+    """TCP listener that runs one GameSession per connection and counts them."""
+
+    def __init__(self, board_size=10, fleet=FLEET, board_class=Board, delay_scale=1.0,
+                 idle_timeout=None, log=None):
+        self.session_options = dict(board_size=board_size, fleet=fleet, board_class=board_class,
+                                    delay_scale=delay_scale, idle_timeout=idle_timeout, log=log)
+        self.active = 0
+        self.served = 0
+        self.games = 0
+        self.tasks = set()  # Running handle() tasks
+
+    def accept(self, reader, writer):
+        """start_server callback: run the session in a task of our own.
+
+        Handing asyncio.start_server a coroutine would make it wrap the
+        session itself, and on Python 3.11 it then logs a traceback for
+        every session cancelled at shutdown.
+        """
+        task = asyncio.create_task(self.handle(reader, writer))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def handle(self, reader, writer):
+        session = GameSession(reader, writer, **self.session_options)
+        self.active += 1
+        try:
+            await session.run()
+        finally:
+            self.active -= 1
+            self.served += 1
+            self.games += session.games
+
+    async def start(self, host='127.0.0.1', port=8765, backlog=4096):
+        """Start listening and return the asyncio server (port 0 picks a free port)."""
+        return await asyncio.start_server(self.accept, host, port, backlog=backlog)
+
+def raise_open_file_limit():
+    """Lift the soft open-file limit to the hard limit, where the platform allows it."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+async def serve(args, fleet, board_class, log):
+    game_server = GameServer(args.size, fleet, board_class, args.delay_scale, args.idle_timeout, log)
+    server = await game_server.start(args.host, args.port)
+    address = server.sockets[0].getsockname()
+    print(f"Serving Battleship on {address[0]}:{address[1]}")
+
+    # Stop cleanly on Ctrl+C or SIGTERM so the game log is flushed
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for name in ('SIGINT', 'SIGTERM'):
+        try:
+            loop.add_signal_handler(getattr(signal, name), stop.set)
+        except (AttributeError, NotImplementedError):
+            pass  # Windows: Ctrl+C still raises KeyboardInterrupt
+
+    start = time.perf_counter()
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(stop.wait(), args.status_interval)
+                return
+            except asyncio.TimeoutError:
+                print(f"[{time.perf_counter() - start:8.0f}s] {game_server.active} connected, "
+                      f"{game_server.served} disconnected, {game_server.games} games started", flush=True)
+    finally:
+        # Sessions still running are cancelled when asyncio.run() exits
+        server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Battleship games against the AI over TCP.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--size', type=int, default=10, help="board size")
+    add_board_arguments(parser)
+    parser.add_argument('--delay-scale', type=float, default=1.0,
+                        help="multiplier for the turn delays (0 disables them)")
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help="disconnect sessions idle for this many seconds")
+    parser.add_argument('--status-interval', type=float, default=10, help="seconds between status lines")
+    parser.add_argument('--record', metavar='PATH', help="append every game to a binary game log (see gamelog.py)")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    board_class, fleet = board_options(parser, args, [args.size])
+    instrument.setup(args.instrument, args.profile)
+    log = None
+    if args.record:
+        from gamelog import GameLogWriter
+        log = GameLogWriter(args.record, args.size, fleet)
+    raise_open_file_limit()
+    try:
+        asyncio.run(serve(args, fleet, board_class, log))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if log is not None:
+            log.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import instrument
+from battleship import AI, FLEET, Board, Ship, add_board_arguments, board_options, setup_ships
+from strategies import DensityAI, MonteCarloAI
+
+
+class HuntOnlyAI(AI):
+    """Baseline strategy: the standard AI with target mode switched off."""
+
+    def get_shot(self, previous_result=None, last_shot=None):
+        return super().get_shot(None, None)
+
+class ParityAI(AI):
+    """Hunt/target AI that hunts on a checkerboard spaced by the smallest ship afloat."""
+
+    def __init__(self, board_size=10, fleet=FLEET):
+        super().__init__(board_size, fleet, parity=True)
+
+# Strategy name -> factory taking (board_size, fleet) and returning an object
+# with the AI.get_shot(previous_result, last_shot) interface
+STRATEGIES = {
+    'hunt_target': AI,
+    'hunt_only': HuntOnlyAI,
+    'parity': ParityAI,
+    'density': DensityAI,
+    'monte_carlo': MonteCarloAI,
+}
+
+# Strategies that think for milliseconds per move, left out of tournaments unless named
+SLOW_STRATEGIES = {'monte_carlo'}
+
+def capture_layout(board):
+    """Return a board's ship placements as a reusable tuple.
+
+    Each entry is (name, size, ship_type, row, col, horizontal), which is
+    everything needed to rebuild the same board with board_from_layout().
+    """
+    layout = []
+    for ship in board.ships:
+        layout.append((ship.name, ship.size, ship.ship_type, *ship.placement()))
+    return tuple(layout)
+
+def board_from_layout(layout, size=10, board_class=Board):
+    """Build a fresh board with the ships from capture_layout()."""
+    board = board_class(size)
+    for name, ship_size, ship_type, row, col, horizontal in layout:
+        board.place_ship(Ship(name, ship_size, ship_type), row, col, horizontal)
+    return board
+
+def random_board(size=10, board_class=Board, fleet=FLEET):
+    """Build a board with a random fleet, exactly as the AI places its ships."""
+    board = board_class(size)
+    setup_ships(board, is_ai=True, fleet=fleet)
+    return board
+
+def fire_until_sunk(ai, board):
+    """Let one AI shoot at a board until every ship is sunk. Returns the shot count."""
+    result = None
+    shot = None
+    shots = 0
+    while True:
+        shot = ai.get_shot(result, shot)
+        result = board.receive_shot(shot[0], shot[1])
+        shots += 1
+        # A miss can never end the game, so skip the fleet check
+        if result != 'miss' and board.all_ships_sunk():
+            return shots
+
+def play_duel(first_ai, first_board, second_ai, second_board):
+    """Play one AI-vs-AI game with no I/O or delays.
+
+    first_ai fires at second_board and second_ai fires at first_board, with
+    first_ai shooting first. Returns (winner, shots) where winner is 0 or 1
+    and shots is the number of shots the winner needed.
+    """
+    ais = (first_ai, second_ai)
+    targets = (second_board, first_board)
+    results = [None, None]
+    last_shots = [None, None]
+    shots = [0, 0]
+    turn = 0
+    while True:
+        ai = ais[turn]
+        board = targets[turn]
+        shot = ai.get_shot(results[turn], last_shots[turn])
+        result = board.receive_shot(shot[0], shot[1])
+        results[turn] = result
+        last_shots[turn] = shot
+        shots[turn] += 1
+        if result != 'miss' and board.all_ships_sunk():
+            return turn, shots[turn]
+        turn = 1 - turn
+
+class SimulationStats:
+    """Running totals for a batch of headless games."""
+
+    def __init__(self):
+        self.games = 0
+        self.wins = [0, 0]
+        self.histogram = {}  # shots to win -> number of games
+        self.sunk = {}  # ship name -> [ships sunk, total shots at that board when sunk]
+        self.elapsed = 0.0
+
+    def record(self, winner, shots=None):
+        """Count one game; shots=None counts the result without a histogram entry."""
+        self.games += 1
+        self.wins[winner] += 1
+        if shots is not None:
+            self.histogram[shots] = self.histogram.get(shots, 0) + 1
+
+    def record_sunk(self, board, ship):
+        """on_sunk callback for Board.subscribe(): note how many shots the ship survived."""
+        totals = self.sunk.setdefault(ship.name, [0, 0])
+        totals[0] += 1
+        totals[1] += len(board.shot_log)
+
+    def merge(self, other):
+        """Fold another SimulationStats into this one."""
+        self.games += other.games
+        self.wins[0] += other.wins[0]
+        self.wins[1] += other.wins[1]
+        for shots, count in other.histogram.items():
+            self.histogram[shots] = self.histogram.get(shots, 0) + count
+        for name, (count, shots) in other.sunk.items():
+            totals = self.sunk.setdefault(name, [0, 0])
+            totals[0] += count
+            totals[1] += shots
+        self.elapsed += other.elapsed
+
+    def mean(self):
+        recorded = sum(self.histogram.values())
+        if not recorded:
+            return 0.0
+        return sum(shots * count for shots, count in self.histogram.items()) / recorded
+
+    def percentile(self, pct):
+        """Return the smallest shot count covering pct percent of recorded games."""
+        if not self.histogram:
+            return 0
+        threshold = sum(self.histogram.values()) * pct / 100
+        seen = 0
+        for shots in sorted(self.histogram):
+            seen += self.histogram[shots]
+            if seen >= threshold:
+                return shots
+        return max(self.histogram)
+
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """Return a human-readable report as a list of lines."""
+        if not self.histogram:
+            return ["No games played."]
+        lines = [
+            f"Games played:   {self.games}",
+            f"Elapsed:        {self.elapsed:.2f}s ({self.games_per_second():,.0f} games/sec, "
+            f"{self.games_per_second() * 60:,.0f} games/min)",
+            f"Wins:           first {self.wins[0]} / second {self.wins[1]}",
+            f"Shots to win:   mean {self.mean():.2f}, min {min(self.histogram)}, "
+            f"median {self.percentile(50)}, p90 {self.percentile(90)}, max {max(self.histogram)}",
+        ]
+        if self.sunk:
+            lines.append("Sunk after:     " + ', '.join(
+                f"{name} {shots / count:.1f}" for name, (count, shots)
+                in sorted(self.sunk.items(), key=lambda item: item[1][1] / item[1][0])) + " shots (mean)")
+        return lines
+
+def simulate(games, mode='duel', board_size=10, seed=None, ai_factory=AI,
+             layout=None, stats=None, board_class=Board, fleet=FLEET, log=None, ship_stats=False):
+    """Play a batch of headless games and return a SimulationStats.
+
+    mode='duel' plays AI vs AI with fresh random fleets every game.
+    mode='fixed' has a single AI fire at the same layout every game; the
+    layout comes from capture_layout() or is drawn once from setup_ships().
+    log is an optional gamelog.GameLogWriter that receives every duel.
+    ship_stats=True subscribes stats.record_sunk to every board to time each ship's sinking.
+    """
+    if seed is not None:
+        random.seed(seed)
+    if stats is None:
+        stats = SimulationStats()
+
+    if mode == 'fixed' and layout is None:
+        layout = capture_layout(random_board(board_size, board_class, fleet))
+
+    start = time.perf_counter()
+    if mode == 'duel':
+        for _ in range(games):
+            first_board = random_board(board_size, board_class, fleet)
+            second_board = random_board(board_size, board_class, fleet)
+            if ship_stats:
+                first_board.subscribe(on_sunk=stats.record_sunk)
+                second_board.subscribe(on_sunk=stats.record_sunk)
+            winner, shots = play_duel(ai_factory(board_size, fleet), first_board,
+                                      ai_factory(board_size, fleet), second_board)
+            stats.record(winner, shots)
+            if log is not None:
+                log.append_game((first_board, second_board), winner)
+    elif mode == 'fixed':
+        for _ in range(games):
+            board = board_from_layout(layout, board_size, board_class)
+            if ship_stats:
+                board.subscribe(on_sunk=stats.record_sunk)
+            stats.record(0, fire_until_sunk(ai_factory(board_size, fleet), board))
+    else:
+        raise ValueError(f"Unknown simulation mode: {mode}")
+    stats.elapsed += time.perf_counter() - start
+    return stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless AI Battleship games and report statistics.")
+    parser.add_argument('-n', '--games', type=int, default=10000, help="number of games to play")
+    parser.add_argument('--mode', choices=['duel', 'fixed'], default='duel',
+                        help="duel: AI vs AI with random fleets; fixed: one AI vs a single fixed layout")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='hunt_target',
+                        help="AI strategy used by every player")
+    parser.add_argument('--size', type=int, default=10, help="board size")
+    add_board_arguments(parser)
+    parser.add_argument('--seed', type=int, default=None, help="random seed for reproducible runs")
+    parser.add_argument('--histogram', action='store_true', help="print the full shots-to-win histogram")
+    parser.add_argument('--ship-stats', action='store_true',
+                        help="report how many shots each ship survives on average")
+    parser.add_argument('--record', metavar='PATH', help="append every duel to a binary game log (see gamelog.py)")
+    parser.add_argument('--budget', type=float, default=5.0, help="monte_carlo: sampling time per move in ms")
+    parser.add_argument('--workers', type=int, default=1, help="monte_carlo: samplers run in parallel per move")
+    parser.add_argument('--pool', choices=['thread', 'process'], default='process',
+                        help="monte_carlo: pool type used when --workers is above 1")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.record and args.mode != 'duel':
+        parser.error("--record needs --mode duel")
+    limit = getattr(STRATEGIES[args.strategy], 'max_board_size', None)
+    if limit is not None and args.size > limit:
+        parser.error(f"--strategy {args.strategy} supports boards up to {limit}x{limit}")
+
+    board_class, fleet = board_options(parser, args, [args.size])
+    instrument.setup(args.instrument, args.profile)
+    log = None
+    if args.record:
+        from gamelog import GameLogWriter
+        log = GameLogWriter(args.record, args.size, fleet)
+    ai_factory = STRATEGIES[args.strategy]
+    executor = None
+    if args.strategy == 'monte_carlo':
+        if args.workers > 1:
+            pool_class = ProcessPoolExecutor if args.pool == 'process' else ThreadPoolExecutor
+            executor = pool_class(args.workers)
+        ai_factory = partial(MonteCarloAI, time_budget=args.budget / 1000, executor=executor,
+                             workers=args.workers)
+    try:
+        stats = simulate(args.games, mode=args.mode, board_size=args.size, seed=args.seed,
+                         ai_factory=ai_factory, board_class=board_class, fleet=fleet, log=log,
+                         ship_stats=args.ship_stats)
+    finally:
+        if log is not None:
+            log.close()
+        if executor is not None:
+            executor.shutdown()
+    for line in stats.summary():
+        print(line)
+    if args.strategy == 'monte_carlo':
+        print(f"Sampling:       {MonteCarloAI.samples_drawn:,} fleets, "
+              f"{MonteCarloAI.samples_per_second():,.0f} samples/sec")
+    if args.histogram:
+        print("\nShots  Games")
+        for shots in sorted(stats.histogram):
+            print(f"{shots:5}  {stats.histogram[shots]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+import random
+import time
+from functools import lru_cache
+from heapq import heapify, heappop, heappush
+
+from battleship import FLEET
+from placement import get_table
+
+# Each unresolved hit inside a placement multiplies its weight by this much,
+# which makes placements through known hits dominate the density map
+TARGET_WEIGHT = 50
+
+# Random footprints tried per ship before a Monte Carlo sample is abandoned
+SAMPLE_TRIES = 20
+# Attempts after which Monte Carlo sampling switches to placing ships
+# through known hits first, if fewer than 1 in 10 samples were kept
+REJECTION_TRIAL = 100
+# Largest board (rows and columns) DensityAI and MonteCarloAI accept. The
+# placement table holds every placement of every ship length, so its memory
+# grows with area x lengths: about 22 MB at 100x100 for the standard fleet
+# and 90 MB at 200x200
+MAX_BOARD_SIZE = 100
+# Boards at least this wide pick shots from a heap instead of scanning every unfired cell
+HEAP_MIN_SIZE = 20
+
+
+@lru_cache(maxsize=None)
+def placement_table(board_size, lengths):
+    """Every ship placement on a board, arranged for density updates.
+
+    Returns (placements, placement_lengths, length_ranges, covering) where
+    placements[p] is a tuple of cell indices (row * board_size + col),
+    placement_lengths[p] is its ship length, length_ranges[length] is the
+    range of placement ids of that length and covering[cell] lists the
+    placements that cover that cell. Placement ids are the footprint indices
+    of placement.PlacementTable, and the result is shared by every
+    DensityAI with the same board and fleet.
+    """
+    table = get_table(board_size, lengths)
+    placements = tuple(tuple(table.cells(p)) for p in range(len(table)))
+    covering = [[] for _ in range(board_size * board_size)]
+    for p, cells in enumerate(placements):
+        for cell in cells:
+            covering[cell].append(p)
+    return (placements, tuple(table.length(p) for p in range(len(table))), table.by_length,
+            tuple(tuple(ps) for ps in covering))
+
+@lru_cache(maxsize=None)
+def initial_scores(board_size, fleet_lengths):
+    """Density map of an untouched board: legal placements per cell, times ship count."""
+    lengths = tuple(sorted(set(fleet_lengths)))
+    placements, placement_lengths, _, _ = placement_table(board_size, lengths)
+    scores = [0] * (board_size * board_size)
+    for cells, length in zip(placements, placement_lengths):
+        count = fleet_lengths.count(length)
+        for cell in cells:
+            scores[cell] += count
+    return tuple(scores)
+
+class DensityAI:
+    """Targeting AI that fires at the cell covered by the most legal ship placements.
+
+    The density map counts, for every cell, the placements of still-afloat
+    ships that avoid known misses and sunk ships. Placements through
+    unresolved hits are weighted by TARGET_WEIGHT per hit, so the AI
+    naturally switches to finishing off damaged ships. The map is updated
+    incrementally: a miss or hit only touches the placements covering that
+    cell, and a sunk result only touches placements of that ship's length.
+    On boards of HEAP_MIN_SIZE and up, unfired cells sit in a max-heap by
+    score that is refreshed only for the cells whose score changed, so
+    picking a shot does not scan the board; smaller boards scan, which is
+    cheaper there.
+    Boards are limited to MAX_BOARD_SIZE by the placement table's memory.
+    """
+
+    max_board_size = MAX_BOARD_SIZE
+
+    def __init__(self, board_size=10, fleet=FLEET):
+        if board_size > MAX_BOARD_SIZE:
+            raise ValueError(f"{type(self).__name__} supports boards up to {MAX_BOARD_SIZE}x{MAX_BOARD_SIZE}")
+        self.board_size = board_size
+        self.ship_lengths = {name: size for name, size, _ in fleet}
+        fleet_lengths = self.fleet_lengths = tuple(size for _, size, _ in fleet)
+        lengths = tuple(sorted(set(fleet_lengths)))
+        (self.placements, self.placement_lengths, self.length_ranges,
+         self.covering) = placement_table(board_size, lengths)
+        self.remaining = {length: fleet_lengths.count(length) for length in lengths}
+        self.scores = list(initial_scores(board_size, fleet_lengths))
+        self.alive = [True] * len(self.placements)
+        self.placement_hits = [0] * len(self.placements)
+        self.unfired = set(range(board_size * board_size))
+        self.heap = [] if board_size >= HEAP_MIN_SIZE else None  # (-score, cell), may hold stale entries
+        self.dirty = set()  # Cells whose score may have changed since the heap was refreshed
+        if self.heap is not None:
+            self._rebuild_heap()
+        self.unresolved_hits = set()
+        self.fired_shots = set()  # Track all shots fired by AI
+
+    def reset(self):
+        """Forget the last game in place, reusing the lists sized for the placement table."""
+        for length in self.remaining:
+            self.remaining[length] = self.fleet_lengths.count(length)
+        self.scores[:] = initial_scores(self.board_size, self.fleet_lengths)
+        self.alive[:] = [True] * len(self.alive)
+        self.placement_hits[:] = [0] * len(self.placement_hits)
+        self.unfired.clear()  # Regrow from empty so ties break as in a fresh AI
+        self.unfired.update(range(self.board_size * self.board_size))
+        self.dirty.clear()
+        if self.heap is not None:
+            self._rebuild_heap()
+        self.unresolved_hits.clear()
+        self.fired_shots.clear()
+
+    def fork(self):
+        """Independent copy; the placement tables are shared, the density map and sets copied."""
+        ai = object.__new__(type(self))
+        ai.__dict__.update(self.__dict__)
+        ai.remaining = self.remaining.copy()
+        ai.scores = self.scores[:]
+        ai.alive = self.alive[:]
+        ai.placement_hits = self.placement_hits[:]
+        ai.unfired = set(self.unfired)
+        ai.heap = None if self.heap is None else self.heap[:]
+        ai.dirty = set(self.dirty)
+        ai.unresolved_hits = set(self.unresolved_hits)
+        ai.fired_shots = set(self.fired_shots)
+        return ai
+
+    def snapshot(self):
+        """Frozen copy of the AI's state for restore(); never call get_shot on it."""
+        return self.fork()
+
+    def restore(self, snapshot):
+        """Return to a snapshot's state; the snapshot stays reusable."""
+        self.__dict__.update(snapshot.fork().__dict__)
+
+    def _weight(self, p):
+        return self.remaining[self.placement_lengths[p]] * TARGET_WEIGHT ** self.placement_hits[p]
+
+    def _adjust(self, p, delta):
+        scores = self.scores
+        for cell in self.placements[p]:
+            scores[cell] += delta
+
+    def _kill(self, p):
+        if self.alive[p]:
+            self.alive[p] = False
+            self._adjust(p, -self._weight(p))
+
+    def _record_miss(self, cell):
+        for p in self.covering[cell]:
+            self._kill(p)
+
+    def _record_hit(self, cell):
+        self.unresolved_hits.add(cell)
+        for p in self.covering[cell]:
+            if self.alive[p]:
+                old = self._weight(p)
+                self.placement_hits[p] += 1
+                self._adjust(p, self._weight(p) - old)
+
+    def _record_sunk(self, cell, name):
+        self._record_hit(cell)
+        length = self.ship_lengths.get(name)
+        if not self.remaining.get(length):
+            return
+
+        # The sunk ship is a placement of its length through this cell made up
+        # entirely of unresolved hits; take the first match
+        sunk_cells = (cell,)
+        for p in self.covering[cell]:
+            cells = self.placements[p]
+            if (self.placement_lengths[p] == length and
+                    all(c in self.unresolved_hits for c in cells)):
+                sunk_cells = cells
+                break
+        for c in sunk_cells:
+            self.unresolved_hits.discard(c)
+            for p in self.covering[c]:
+                self._kill(p)
+
+        # One fewer ship of this length: every surviving placement loses one share
+        for p in self.length_ranges[length]:
+            if self.alive[p]:
+                self._adjust(p, -TARGET_WEIGHT ** self.placement_hits[p])
+        self.remaining[length] -= 1
+
+    def _mark_dirty(self, cell):
+        """Note the cells a miss or hit at cell may have rescored, for the heap."""
+        if self.heap is not None:
+            placements = self.placements
+            for p in self.covering[cell]:
+                self.dirty.update(placements[p])
+
+    def _rebuild_heap(self):
+        scores = self.scores
+        self.heap[:] = [(-scores[cell], cell) for cell in self.unfired]
+        heapify(self.heap)
+        self.dirty.clear()
+
+    def observe(self, previous_result, last_shot):
+        """Fold the result of the last shot into the density map."""
+        if last_shot and previous_result:
+            cell = last_shot[0] * self.board_size + last_shot[1]
+            if previous_result == 'miss':
+                self._record_miss(cell)
+                self._mark_dirty(cell)
+            elif previous_result == 'hit':
+                self._record_hit(cell)
+                self._mark_dirty(cell)
+            elif previous_result.startswith('sunk_'):
+                self._record_sunk(cell, previous_result[len('sunk_'):])
+                # A sinking rescored every placement of the ship's length
+                if self.heap is not None:
+                    self._rebuild_heap()
+
+    def fire(self, cell):
+        self.unfired.discard(cell)
+        target = divmod(cell, self.board_size)
+        self.fired_shots.add(target)
+        return target
+
+    def best_cell(self):
+        """The highest-scoring unfired cell."""
+        scores, unfired, heap = self.scores, self.unfired, self.heap
+        if heap is None:
+            return max(unfired, key=scores.__getitem__)
+        if len(heap) > 2 * len(unfired) + 64:
+            # Mostly stale entries
+            self._rebuild_heap()
+        for cell in self.dirty:
+            if cell in unfired:
+                heappush(heap, (-scores[cell], cell))
+        self.dirty.clear()
+        while True:
+            score, cell = heap[0]
+            if cell in unfired and -score == scores[cell]:
+                return cell
+            heappop(heap)
+
+    def get_shot(self, previous_result=None, last_shot=None):
+        """Fold in the previous result, then fire at the highest-density unfired cell."""
+        self.observe(previous_result, last_shot)
+        return self.fire(self.best_cell())
+
+def sample_fleets(board_size, lengths, remaining, alive, hits, deadline, seed=None):
+    """Draw random fleets consistent with what a shooter has seen until time.perf_counter() reaches deadline.
+
+    remaining maps ship length -> ships of that length still afloat,
+    alive[p] is true for placements that avoid every miss and sunk ship,
+    and hits are the cells of hits not yet attributed to a sunk ship.
+    Ships are placed one at a time among the open placements and a sample
+    is kept only if nothing overlaps and every hit is covered. When few
+    samples survive that (many scattered hits), the rest of the budget
+    places ships through the hits first, which is slightly biased but
+    rarely wasted. Returns (counts, samples) where counts[cell] is the
+    number of kept samples with a ship on that cell. A module-level
+    function, so it can run in a process pool; the deadline is absolute so
+    samplers that start late in a pool still stop on time.
+    """
+    placements, placement_lengths, length_ranges, covering = placement_table(board_size, lengths)
+    rng = random.Random(seed)
+    fleet = [length for length in sorted(remaining, reverse=True) for _ in range(remaining[length])]
+    open_placements = {length: [p for p in length_ranges[length] if alive[p]] for length in remaining}
+    hit_placements = {cell: [p for p in covering[cell] if alive[p] and remaining.get(placement_lengths[p])]
+                      for cell in hits}
+    hits = list(hits)
+    hit_set = set(hits)
+    counts = [0] * (board_size * board_size)
+    samples = attempts = 0
+    hits_first = False
+    clock = time.perf_counter
+    while clock() < deadline:
+        attempts += 1
+        if attempts == REJECTION_TRIAL and samples * 10 < attempts:
+            hits_first = True
+        occupied = set()
+        left = list(fleet)
+        ok = True
+        if hits_first:
+            rng.shuffle(hits)
+            for cell in hits:
+                if cell in occupied:
+                    continue
+                options = hit_placements[cell]
+                for _ in range(SAMPLE_TRIES if options else 0):
+                    p = options[rng.randrange(len(options))]
+                    if placement_lengths[p] in left and occupied.isdisjoint(placements[p]):
+                        left.remove(placement_lengths[p])
+                        occupied.update(placements[p])
+                        break
+                else:
+                    ok = False
+                    break
+        for length in left if ok else ():
+            options = open_placements[length]
+            for _ in range(SAMPLE_TRIES if options else 0):
+                p = options[rng.randrange(len(options))]
+                if occupied.isdisjoint(placements[p]):
+                    occupied.update(placements[p])
+                    break
+            else:
+                ok = False
+                break
+        if ok and (hits_first or hit_set <= occupied):
+            samples += 1
+            for cell in occupied:
+                counts[cell] += 1
+    return counts, samples
+
+class MonteCarloAI(DensityAI):
+    """Fires at the cell most often covered by random fleets consistent with the results so far.
+
+    Each move samples fleets with sample_fleets() for time_budget seconds
+    and picks the unfired cell with the highest hit count, breaking ties by
+    the density map (which is also used if no sample survives). A larger
+    budget means more samples and better estimates. With an executor
+    (a concurrent.futures thread or process pool), each move runs `workers`
+    samplers in it at once and merges their counts. Samples drawn and time
+    spent are totalled on the class for samples_per_second(). Every move
+    scans the open placements and the unfired cells, so it costs O(area)
+    on top of the sampling budget.
+    """
+
+    samples_drawn = 0
+    sampling_seconds = 0.0
+
+    def __init__(self, board_size=10, fleet=FLEET, time_budget=0.005, executor=None, workers=1):
+        super().__init__(board_size, fleet)
+        self.lengths = tuple(sorted(self.remaining))
+        self.time_budget = time_budget
+        self.executor = executor
+        self.workers = workers
+
+    def sample(self):
+        """Return (counts, samples) for the current position."""
+        remaining = {length: n for length, n in self.remaining.items() if n}
+        start = time.perf_counter()
+        args = (self.board_size, self.lengths, remaining, bytes(self.alive),
+                tuple(self.unresolved_hits), start + self.time_budget)
+        if self.executor is None:
+            counts, samples = sample_fleets(*args, seed=random.random())
+        else:
+            futures = [self.executor.submit(sample_fleets, *args, seed=random.random())
+                       for _ in range(self.workers)]
+            counts, samples = futures[0].result()
+            for future in futures[1:]:
+                more, extra = future.result()
+                counts = [a + b for a, b in zip(counts, more)]
+                samples += extra
+        MonteCarloAI.sampling_seconds += time.perf_counter() - start
+        MonteCarloAI.samples_drawn += samples
+        return counts, samples
+
+    def get_shot(self, previous_result=None, last_shot=None):
+        """Fold in the previous result, then fire at the unfired cell hit by the most sampled fleets."""
+        self.observe(previous_result, last_shot)
+        counts, samples = self.sample()
+        scores = self.scores
+        if samples:
+            cell = max(self.unfired, key=lambda c: (counts[c], scores[c]))
+        else:
+            cell = self.best_cell()
+        return self.fire(cell)
+
+    @classmethod
+    def samples_per_second(cls):
+        return cls.samples_drawn / cls.sampling_seconds if cls.sampling_seconds else 0.0
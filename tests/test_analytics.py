@@ -0,0 +1,29 @@
+import random
+
+from analytics import Report, logged_traces, simulated_traces
+from battleship import AI, FLEET
+from gamelog import GameLogWriter
+from simulate import play_duel, random_board
+
+
+def test_logged_games_counted_once(tmp_path):
+    # A logged game yields a trace per player but is still one game
+    random.seed(3)
+    path = tmp_path / 'games.bsgl'
+    with GameLogWriter(path) as log:
+        for _ in range(4):
+            boards = (random_board(), random_board())
+            winner, _ = play_duel(AI(), boards[0], AI(), boards[1])
+            log.append_game(boards, winner)
+    report = Report().consume(logged_traces(path))
+    assert report.games == 4
+    assert report.stats[('player0', 'first_hit')][0].count == 4
+    assert report.stats[('player1', 'first_hit')][0].count == 4
+
+def test_simulated_games_counted():
+    random.seed(4)
+    report = Report().consume(simulated_traces('parity', 3, fleet=FLEET))
+    other = Report().consume(simulated_traces('hunt_target', 2, fleet=FLEET))
+    report.merge(other)
+    assert report.games == 5
+    assert report.stats[('parity', 'shots')][0].count == 3
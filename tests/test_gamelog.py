@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from battleship import AI
+from bitboard import BitBoard
+from gamelog import GameLogReader, GameLogWriter
+from simulate import capture_layout, play_duel, random_board
+
+# Ship types and names that are more than one byte in UTF-8
+FLEET = [("Énorme", 4, 'É'), ("Navire", 3, '🚢'), ("Destroyer", 2, 'D')]
+
+
+def record_games(path, games, fleet=FLEET, board_class=BitBoard):
+    """Play AI duels into a log; returns [(layouts, shot logs, winner)] as written."""
+    played = []
+    with GameLogWriter(path, 10, fleet) as log:
+        for _ in range(games):
+            boards = (random_board(10, board_class, fleet), random_board(10, board_class, fleet))
+            winner, _ = play_duel(AI(10, fleet), boards[0], AI(10, fleet), boards[1])
+            log.append_game(boards, winner)
+            played.append(([capture_layout(board) for board in boards],
+                           [list(board.shot_log) for board in boards], winner))
+    return played
+
+def test_round_trip(tmp_path):
+    random.seed(1)
+    path = tmp_path / 'games.bsgl'
+    played = record_games(path, 5)
+
+    with GameLogReader(path) as log:
+        assert log.board_size == 10
+        assert log.fleet == FLEET
+        scanned = list(log.scan())
+        assert [(winner, count) for _, winner, count in scanned] == [
+            (winner, sum(map(len, shot_logs))) for _, shot_logs, winner in played]
+        for (offset, _, _), (layouts, shot_logs, winner) in zip(scanned, played):
+            record = log.read(offset)
+            assert record.winner == winner
+            assert [capture_layout(board) for board in record.boards()] == layouts
+            fired = ([], [])
+            boards = None
+            for shooter, pos, result, boards in record.replay():
+                assert result != 'already_shot'
+                fired[1 - shooter].append(pos)
+            assert list(fired) == shot_logs
+            assert boards[1 - winner].all_ships_sunk()
+
+def test_append_checks_fleet(tmp_path):
+    path = tmp_path / 'games.bsgl'
+    random.seed(2)
+    record_games(path, 1)
+    with pytest.raises(ValueError, match="fleet differs"):
+        GameLogWriter(path, 10, [("Énorme", 4, 'E'), ("Navire", 3, '🚢'), ("Destroyer", 2, 'D')])
+
+def test_rejects_oversized_text(tmp_path):
+    with pytest.raises(ValueError, match="255 bytes"):
+        GameLogWriter(tmp_path / 'games.bsgl', 10, [("x" * 256, 2, 'X')])
@@ -0,0 +1,36 @@
+import pytest
+
+from battleship import parse_placement, parse_target, target_name
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('A1', (0, 0)),
+    ('c7', (6, 2)),
+    (' J10 ', (9, 9)),
+])
+def test_parse_target(text, expected):
+    assert parse_target(text, 10) == expected
+
+@pytest.mark.parametrize('text', ['', 'A', '5', 'A0', 'A11', 'K1', 'A-1', 'A 5', 'A1.5'])
+def test_parse_target_rejects_off_board(text):
+    assert parse_target(text, 10) is None
+
+@pytest.mark.parametrize('text', ['A²', 'A٣', 'B１', 'C৪'])
+def test_parse_target_rejects_non_ascii_digits(text):
+    # str.isdigit() accepts these but int() does not, which used to raise ValueError
+    assert parse_target(text, 10) is None
+
+def test_parse_target_wide_board():
+    assert parse_target('AB12', 30) == (11, 27)
+    assert parse_target(target_name(29, 29), 30) == (29, 29)
+
+@pytest.mark.parametrize('text, expected', [
+    ('A5 H', (4, 0, True)),
+    ('c7 v', (6, 2, False)),
+])
+def test_parse_placement(text, expected):
+    assert parse_placement(text, 10) == expected
+
+@pytest.mark.parametrize('text', ['A5', 'A5 X', 'A5 H V', 'Z5 H', 'A² H'])
+def test_parse_placement_rejects(text):
+    assert parse_placement(text, 10) is None
@@ -0,0 +1,137 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from battleship import FLEET, add_board_arguments, board_options
+from simulate import SLOW_STRATEGIES, STRATEGIES, SimulationStats, play_duel, random_board
+
+
+def chunk_seed(seed, first, second, chunk):
+    """Seed string for one chunk of games.
+
+    Seeds depend only on the pairing and chunk number, never on which worker
+    runs the chunk, so results are identical for any number of workers.
+    """
+    return f"{seed}/{first}/{second}/{chunk}"
+
+def play_chunk(task):
+    """Worker entry point: play one chunk of games for a strategy pairing.
+
+    Returns (first, second, stats) where stats.wins[0] counts wins for the
+    first strategy and the histogram holds the first strategy's shots to win.
+    Who shoots first alternates every game so neither side gets the opening
+    move advantage.
+    """
+    first, second, games, board_size, fleet, seed = task
+    random.seed(seed)
+    first_factory = STRATEGIES[first]
+    second_factory = STRATEGIES[second]
+    stats = SimulationStats()
+    start = time.perf_counter()
+    for game in range(games):
+        first_board = random_board(board_size, fleet=fleet)
+        second_board = random_board(board_size, fleet=fleet)
+        if game % 2 == 0:
+            winner, shots = play_duel(first_factory(board_size, fleet), first_board,
+                                      second_factory(board_size, fleet), second_board)
+        else:
+            winner, shots = play_duel(second_factory(board_size, fleet), second_board,
+                                      first_factory(board_size, fleet), first_board)
+            winner = 1 - winner
+        stats.record(winner, shots if winner == 0 else None)
+    stats.elapsed = time.perf_counter() - start
+    return first, second, stats
+
+def build_tasks(strategies, games, board_size, fleet, seed, chunk_size):
+    """Split every strategy pairing into fixed-size chunks of games."""
+    tasks = []
+    for first in strategies:
+        for second in strategies:
+            remaining = games
+            chunk = 0
+            while remaining > 0:
+                count = min(chunk_size, remaining)
+                tasks.append((first, second, count, board_size, fleet,
+                              chunk_seed(seed, first, second, chunk)))
+                remaining -= count
+                chunk += 1
+    return tasks
+
+def run_tournament(strategies, games=1000, board_size=10, seed=0, workers=None,
+                   chunk_size=500, progress=None, fleet=FLEET):
+    """Play every strategy against every other across a process pool.
+
+    Returns a dict mapping (first, second) to the merged SimulationStats for
+    that pairing, seen from the first strategy's side. Chunk results are
+    merged as they arrive; progress, if given, is called with
+    (chunks_done, chunks_total) after each one.
+    """
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {name}")
+
+    tasks = build_tasks(strategies, games, board_size, fleet, seed, chunk_size)
+    results = {(first, second): SimulationStats() for first in strategies for second in strategies}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_chunk, task) for task in tasks]
+        for done, future in enumerate(as_completed(futures), 1):
+            first, second, stats = future.result()
+            results[(first, second)].merge(stats)
+            if progress:
+                progress(done, len(tasks))
+    return results
+
+def format_matrix(strategies, results):
+    """Return win-rate and mean-shots tables as a list of lines."""
+    width = max(len(name) for name in strategies) + 2
+    header = ' ' * width + ''.join(name.rjust(width) for name in strategies)
+
+    lines = ["Win rate (row strategy vs column strategy)", header]
+    for first in strategies:
+        cells = []
+        for second in strategies:
+            stats = results[(first, second)]
+            rate = stats.wins[0] / stats.games if stats.games else 0.0
+            cells.append(f"{rate:.1%}".rjust(width))
+        lines.append(first.ljust(width) + ''.join(cells))
+
+    lines += ["", "Mean shots to win (row strategy's wins)", header]
+    for first in strategies:
+        cells = [f"{results[(first, second)].mean():.2f}".rjust(width) for second in strategies]
+        lines.append(first.ljust(width) + ''.join(cells))
+    return lines
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play every AI strategy against every other across all CPU cores.")
+    default = sorted(set(STRATEGIES) - SLOW_STRATEGIES)
+    parser.add_argument('strategies', nargs='*', default=default,
+                        help=f"strategies to include (default: {', '.join(default)}; "
+                             f"also available: {', '.join(sorted(SLOW_STRATEGIES))})")
+    parser.add_argument('-n', '--games', type=int, default=10000, help="games per strategy pairing")
+    parser.add_argument('--size', type=int, default=10, help="board size")
+    add_board_arguments(parser, backend=False)
+    parser.add_argument('--seed', type=int, default=0, help="base random seed")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument('--chunk-size', type=int, default=500, help="games per work unit")
+    args = parser.parse_args(argv)
+    _, fleet = board_options(parser, args, [args.size])
+
+    def progress(done, total):
+        print(f"\r{done}/{total} chunks", end='', flush=True)
+
+    start = time.perf_counter()
+    results = run_tournament(args.strategies, games=args.games, board_size=args.size,
+                             seed=args.seed, workers=args.workers,
+                             chunk_size=args.chunk_size, progress=progress,
+                             fleet=fleet)
+    elapsed = time.perf_counter() - start
+    total_games = sum(stats.games for stats in results.values())
+    print(f"\r{total_games} games in {elapsed:.2f}s "
+          f"({total_games / elapsed:,.0f} games/sec on {args.workers} workers)\n")
+    for line in format_matrix(args.strategies, results):
+        print(line)
+
+if __name__ == "__main__":
+    main()
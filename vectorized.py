@@ -0,0 +1,226 @@
+"""Batched NumPy game kernel: plays thousands of one-sided games in lockstep.
+
+Requires NumPy (pip install numpy). Each game is one AI firing at one board
+until the fleet is sunk, using the same hunt/target policy as battleship.AI.
+Two independent one-sided games make a duel: the first player wins if it
+needs no more shots than the second, which lets the results be compared
+directly with simulate.py.
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+from battleship import FLEET, add_board_arguments, board_options, check_fleet
+from placement import get_table
+from simulate import SimulationStats, simulate
+
+# Rounds of random draws per ship before the games still waiting pick among the free footprints
+REJECTION_ROUNDS = 32
+
+
+def random_fleets(rng, games, board_size=10, fleet=FLEET):
+    """Return a (games, board_size ** 2) ship-id grid with one random fleet per game.
+
+    Water is -1. Ships are placed in fleet order by drawing a uniform row,
+    column and orientation until the ship fits, exactly like
+    setup_ships(is_ai=True), but for every game at once. Games where the
+    ship still has not fit after REJECTION_ROUNDS draws pick uniformly
+    among the free footprints instead, which is the same distribution, so
+    crowded boards cannot stall. Raises ValueError if the fleet cannot fit.
+    """
+    check_fleet(fleet, board_size)
+    grid = np.full((games, board_size * board_size), -1, dtype=np.int16)
+    for ship_id, (_, length, _) in enumerate(fleet):
+        offsets = np.arange(length)
+        pending = np.arange(games)
+        for _ in range(REJECTION_ROUNDS):
+            if not pending.size:
+                break
+            rows = rng.integers(0, board_size, pending.size)
+            cols = rng.integers(0, board_size, pending.size)
+            horizontal = rng.random(pending.size) < 0.5
+            fits = np.where(horizontal, cols, rows) + length <= board_size
+            r = rows[:, None] + np.where(horizontal[:, None], 0, offsets)
+            c = cols[:, None] + np.where(horizontal[:, None], offsets, 0)
+            cells = np.minimum(r, board_size - 1) * board_size + np.minimum(c, board_size - 1)
+            ok = fits & (grid[pending[:, None], cells] == -1).all(axis=1)
+            placed = pending[ok]
+            grid[placed[:, None], cells[ok]] = ship_id
+            pending = pending[~ok]
+        if pending.size:
+            table = get_table(board_size, (length,))
+            footprints = np.array([list(table.cells(index)) for index in table.by_length[length]])
+            free = (grid[pending[:, None, None], footprints] == -1).all(axis=2)
+            if not free.any(axis=1).all():
+                raise ValueError(f"No room left for a ship of size {length}")
+            # A random key per free footprint; the largest picks one uniformly
+            pick = np.where(free, rng.random(free.shape), -1.0).argmax(axis=1)
+            grid[pending[:, None], footprints[pick]] = ship_id
+    return grid
+
+class BatchKernel:
+    """N one-sided games stored as arrays and advanced one shot per step.
+
+    Per game: a ship-id grid, a shot mask, hits per ship, a FIFO target queue
+    (ring of cell indices with head/tail pointers) and a random hunt order.
+    Finished games are dropped from every array, so each step only touches
+    games that are still running.
+    """
+
+    # Attributes holding one row per active game
+    PER_GAME = ('ship_grid', 'shot', 'hits', 'afloat', 'shots', 'game',
+                'queue', 'queued', 'head', 'tail', 'hunt_order', 'hunt_ptr')
+
+    def __init__(self, ship_grid, board_size=10, fleet=FLEET, rng=None):
+        rng = rng if rng is not None else np.random.default_rng()
+        games, cells = ship_grid.shape
+        self.board_size = board_size
+        self.cells = cells
+        self.sizes = np.array([size for _, size, _ in fleet], dtype=np.int16)
+        self.ship_grid = ship_grid
+        self.shot = np.zeros((games, cells), dtype=bool)
+        self.hits = np.zeros((games, len(fleet)), dtype=np.int16)
+        self.afloat = np.full(games, len(fleet), dtype=np.int16)
+        self.shots = np.zeros(games, dtype=np.int32)
+        self.game = np.arange(games)
+        # Every cell enters a game's queue at most once, so `cells` slots suffice
+        self.queue = np.zeros((games, cells), dtype=np.int32)
+        self.queued = np.zeros((games, cells), dtype=bool)
+        self.head = np.zeros(games, dtype=np.int32)
+        self.tail = np.zeros(games, dtype=np.int32)
+        # Walking a random permutation and skipping fired cells picks uniformly
+        # among unfired cells, like AI's randint loop but without retries
+        self.hunt_order = rng.random((games, cells)).argsort(axis=1).astype(np.int32)
+        self.hunt_ptr = np.zeros(games, dtype=np.int32)
+        self.results = np.zeros(games, dtype=np.int32)
+
+    def _skip_fired(self, rows, order, ptr, end):
+        """Advance ptr past entries of order that were already fired at."""
+        last = order.shape[1] - 1
+        while True:
+            pending = ptr < end
+            stale = pending & self.shot[rows, order[rows, np.minimum(ptr, last)]]
+            if not stale.any():
+                return
+            ptr += stale
+
+    def _enqueue_neighbours(self, rows, targets):
+        """Queue the unfired, unqueued cells next to each hit (up, down, left, right)."""
+        n = self.board_size
+        row, col = np.divmod(targets, n)
+        for delta, valid in ((-n, row > 0), (n, row < n - 1), (-1, col > 0), (1, col < n - 1)):
+            neighbour = np.clip(targets + delta, 0, self.cells - 1)
+            valid = valid & ~self.shot[rows, neighbour] & ~self.queued[rows, neighbour]
+            r = rows[valid]
+            cells = neighbour[valid]
+            self.queue[r, self.tail[r]] = cells
+            self.queued[r, cells] = True
+            self.tail[r] += 1
+
+    def step(self):
+        """Fire one shot in every active game and drop the games that finished."""
+        rows = np.arange(self.game.size)
+
+        # Target mode: pop queued cells, skipping any fired since they were queued
+        self._skip_fired(rows, self.queue, self.head, self.tail)
+        use_queue = self.head < self.tail
+        self._skip_fired(rows, self.hunt_order, self.hunt_ptr, self.cells)
+        targets = np.where(use_queue,
+                           self.queue[rows, np.minimum(self.head, self.cells - 1)],
+                           self.hunt_order[rows, np.minimum(self.hunt_ptr, self.cells - 1)])
+        self.head += use_queue
+        self.hunt_ptr += ~use_queue
+
+        # Resolve shots
+        self.shot[rows, targets] = True
+        self.shots += 1
+        ship = self.ship_grid[rows, targets]
+        hit_rows = np.flatnonzero(ship >= 0)
+        hit_ship = ship[hit_rows]
+        self.hits[hit_rows, hit_ship] += 1
+        sunk = self.hits[hit_rows, hit_ship] == self.sizes[hit_ship]
+        self.afloat[hit_rows[sunk]] -= 1
+        # Like AI.get_shot, only a plain 'hit' (not a sinking shot) queues neighbours
+        self._enqueue_neighbours(hit_rows[~sunk], targets[hit_rows[~sunk]])
+
+        done = self.afloat == 0
+        if done.any():
+            self.results[self.game[done]] = self.shots[done]
+            keep = ~done
+            for name in self.PER_GAME:
+                setattr(self, name, getattr(self, name)[keep])
+
+    def run(self):
+        """Play every game to the end and return shots-to-sink per game."""
+        while self.game.size:
+            self.step()
+        return self.results
+
+def solo_games(games, board_size=10, fleet=FLEET, rng=None):
+    """Play `games` one-sided games and return the shots each needed."""
+    rng = rng if rng is not None else np.random.default_rng()
+    grid = random_fleets(rng, games, board_size, fleet)
+    return BatchKernel(grid, board_size, fleet, rng).run()
+
+def simulate_duels(games, board_size=10, fleet=FLEET, seed=None, batch_size=10000, stats=None):
+    """Play AI-vs-AI duels in batches and return a SimulationStats like simulate.simulate()."""
+    rng = np.random.default_rng(seed)
+    if stats is None:
+        stats = SimulationStats()
+    start = time.perf_counter()
+    remaining = games
+    while remaining > 0:
+        count = min(batch_size, remaining)
+        shots = solo_games(2 * count, board_size, fleet, rng).reshape(count, 2)
+        # The first player shoots first, so it wins ties
+        first_wins = shots[:, 0] <= shots[:, 1]
+        winning_shots = np.where(first_wins, shots[:, 0], shots[:, 1])
+        stats.games += count
+        stats.wins[0] += int(first_wins.sum())
+        stats.wins[1] += int(count - first_wins.sum())
+        values, counts = np.unique(winning_shots, return_counts=True)
+        for value, n in zip(values.tolist(), counts.tolist()):
+            stats.histogram[value] = stats.histogram.get(value, 0) + n
+        remaining -= count
+    stats.elapsed += time.perf_counter() - start
+    return stats
+
+def mean_and_variance(stats):
+    """Mean and variance of shots to win from a SimulationStats histogram."""
+    total = sum(stats.histogram.values())
+    mean = stats.mean()
+    variance = sum(count * (shots - mean) ** 2 for shots, count in stats.histogram.items()) / total
+    return mean, variance
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play AI-vs-AI Battleship duels with the batched NumPy kernel.")
+    parser.add_argument('-n', '--games', type=int, default=100000, help="number of duels to play")
+    parser.add_argument('--size', type=int, default=10, help="board size")
+    add_board_arguments(parser, backend=False)
+    parser.add_argument('--seed', type=int, default=None, help="random seed for reproducible runs")
+    parser.add_argument('--batch-size', type=int, default=10000, help="duels per lockstep batch")
+    parser.add_argument('--compare', type=int, metavar='GAMES', default=0,
+                        help="also play this many duels on the scalar engine and compare the results")
+    args = parser.parse_args(argv)
+
+    _, fleet = board_options(parser, args, [args.size])
+    stats = simulate_duels(args.games, board_size=args.size, fleet=fleet, seed=args.seed,
+                           batch_size=args.batch_size)
+    print("Vectorized kernel")
+    for line in stats.summary():
+        print(line)
+
+    if args.compare:
+        scalar = simulate(args.compare, board_size=args.size, seed=args.seed, fleet=fleet)
+        print("\nScalar engine")
+        for line in scalar.summary():
+            print(line)
+        mean_a, var_a = mean_and_variance(stats)
+        mean_b, var_b = mean_and_variance(scalar)
+        z = (mean_a - mean_b) / math.sqrt(var_a / stats.games + var_b / scalar.games)
+        print(f"\nMean difference {mean_a - mean_b:+.3f} shots (z = {z:+.2f}; |z| < 3 means no detectable difference)")
+
+if __name__ == "__main__":
+    main()